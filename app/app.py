@@ -8,6 +8,7 @@ from flask import Flask, render_template, jsonify, request
 from flask_marshmallow import Marshmallow
 from flasgger import Swagger
 from marshmallow import ValidationError
+import logging
 import os
 import sqlite3
 import socket
@@ -23,6 +24,16 @@ try:
 except ImportError:
     NETIFACES_AVAILABLE = False
 
+log = logging.getLogger(__name__)
+
+# run_production.py installs its own handlers; `python app.py` logs to the
+# console. Configured before the blueprints import so their startup logs show.
+if __name__ == '__main__':
+    logging.basicConfig(
+        level=os.environ.get('LOG_LEVEL', 'INFO').upper(),
+        format='%(asctime)s %(levelname)s %(name)s: %(message)s'
+    )
+
 # Initialize Flask app
 # Configure static files to be served from 'assets' directory
 app = Flask(__name__, static_folder='assets', static_url_path='/assets')
@@ -114,7 +125,7 @@ try:
     apispec_dict = _apispec.to_dict()
     schema_components = apispec_dict.get('components', {}).get('schemas', {})
 except Exception as e:
-    print(f"Warning: Could not extract schemas from APISpec: {e}")
+    log.warning("Could not extract schemas from APISpec: %s", e)
     schema_components = {}
 
 # Configure Swagger with registered schemas from APISpec
@@ -335,9 +346,9 @@ def init_db():
             
             # Record migration
             cursor.execute('INSERT INTO migrations (filename) VALUES (?)', (filename,))
-            print(f"Applied migration: {filename}")
+            log.info("Applied migration: %s", filename)
         except Exception as e:
-            print(f"Error applying migration {filename}: {e}")
+            log.error("Error applying migration %s: %s", filename, e)
             raise
     
     conn.commit()
@@ -510,4 +521,6 @@ if __name__ == '__main__':
     finally:
         # Stop scheduler when Flask shuts down
         sync_scheduler.stop()
+        from services.sync_service import get_sync_service
+        get_sync_service().close()
 
@@ -0,0 +1,10 @@
+-- Location reports node/time index migration
+-- Sync and paging queries filter on node_id and a created_at range and
+-- page by (created_at, id); this index serves them with one range search
+-- and no sort step.
+
+CREATE INDEX IF NOT EXISTS idx_node_created_at
+ON location_reports(node_id, created_at, id);
+
+-- idx_node is a prefix of the new index, so it only costs writes now
+DROP INDEX IF EXISTS idx_node;
@@ -3,7 +3,7 @@ Location tracking models for disaster relief operations
 """
 
 from dataclasses import dataclass, asdict
-from datetime import datetime, timezone
+import time
 from enum import Enum
 from typing import Optional, Dict, Any
 from uuid import UUID, uuid4
@@ -50,6 +50,9 @@ class GeoLocation:
 @dataclass
 class LocationReport:
     """A location report for a tracked entity"""
+    # No per-instance __dict__: peer pulls and batch uploads build one per report
+    __slots__ = ('id', 'entity_type', 'entity_id', 'node_id', 'position', 'created_at', 'metadata')
+    
     id: UUID
     entity_type: EntityType
     entity_id: UUID
@@ -103,7 +106,7 @@ class LocationReport:
             created_at: Optional UTC milliseconds timestamp (defaults to now())
         """
         if created_at is None:
-            created_at = int(datetime.now(timezone.utc).timestamp() * 1000)
+            created_at = time.time_ns() // 1_000_000
         
         return LocationReport(
             id=uuid4(),
@@ -13,6 +13,7 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent))
 
 from services.location_service import LocationService
+from utils.json_response import json_response
 from services.cluster_service import get_cluster_service
 from models.location import LocationReport, EntityType, GeoLocation
 from schemas.location_schemas import (
@@ -24,7 +25,8 @@ from schemas.location_schemas import (
     NearbyRequestSchema,
     NearbyResponseSchema,
     EntityTypesResponseSchema,
-    NodeIdResponseSchema
+    NodeIdResponseSchema,
+    location_request_schema
 )
 
 location_bp = Blueprint('location', __name__, url_prefix='/api/locations')
@@ -68,15 +70,6 @@ def schema_to_dict(schema_class):
     # Fallback: if schema not found, return a reference (shouldn't happen)
     return {'$ref': f'#/components/schemas/{schema_name}'}
 
-# Initialize schema instances for validation (used in route handlers)
-location_request_schema = LocationRequestSchema()
-location_response_schema = LocationSuccessResponseSchema()
-location_list_schema = LocationListResponseSchema()
-nearby_request_schema = NearbyRequestSchema()
-nearby_response_schema = NearbyResponseSchema()
-entity_types_schema = EntityTypesResponseSchema()
-node_id_schema = NodeIdResponseSchema()
-
 
 @location_bp.route('/', methods=['POST'])
 @swag_from({
@@ -119,16 +112,15 @@ node_id_schema = NodeIdResponseSchema()
 def add_location():
     """Record a new location report"""
     try:
-        # Validate and deserialize request
-        errors = location_request_schema.validate(request.json)
-        if errors:
+        # Validate and deserialize request (load() validates as it deserializes)
+        try:
+            data = location_request_schema.load(request.json)
+        except ValidationError as e:
             return jsonify({
                 'status': 'error',
-                'message': f'Validation error: {errors}'
+                'message': f'Validation error: {e.messages}'
             }), 400
         
-        data = location_request_schema.load(request.json)
-        
         report = LocationReport.create_new(
             entity_type=EntityType(data['entity_type']),
             entity_id=data['entity_id'],
@@ -140,10 +132,10 @@ def add_location():
         
         location_service.add_location(report)
         
-        return jsonify({
+        return json_response({
             'status': 'success',
             'data': report.to_dict()
-        }), 201
+        }, 201)
         
     except (KeyError, ValueError) as e:
         return jsonify({
@@ -265,13 +257,12 @@ def add_locations_batch():
         
         for idx, location_data in enumerate(locations):
             try:
-                errors_validate = location_request_schema.validate(location_data)
-                if errors_validate:
-                    errors.append(f'Location {idx}: Validation error - {errors_validate}')
+                try:
+                    data = location_request_schema.load(location_data)
+                except ValidationError as e:
+                    errors.append(f'Location {idx}: Validation error - {e.messages}')
                     continue
                 
-                data = location_request_schema.load(location_data)
-                
                 report = LocationReport.create_new(
                     entity_type=EntityType(data['entity_type']),
                     entity_id=data['entity_id'],
@@ -298,13 +289,13 @@ def add_locations_batch():
         
         failed_count = len(errors)
         
-        return jsonify({
+        return json_response({
             'status': 'success',
             'created': created_count,
             'failed': failed_count,
             'errors': errors if errors else None,
             'data': [r.to_dict() for r in created_reports]
-        }), 201
+        }, 201)
         
     except Exception as e:
         return jsonify({
@@ -5,6 +5,7 @@ MBTiles serving routes
 from flask import Blueprint, Response, jsonify, request
 from flasgger import swag_from
 from pathlib import Path
+import logging
 import os
 import sys
 sys.path.append(str(Path(__file__).parent.parent))
@@ -13,6 +14,8 @@ from services.mbtiles_service import MBTilesService
 
 tiles_bp = Blueprint('tiles', __name__, url_prefix='/api/tiles')
 
+log = logging.getLogger(__name__)
+
 # Path to MBTiles file
 MBTILES_FILE = os.path.join(os.path.dirname(__file__), '..', 'tiles', 'berlin_tiles3.mbtiles')
 
@@ -21,16 +24,16 @@ mbtiles_service = None
 try:
     if os.path.exists(MBTILES_FILE):
         mbtiles_service = MBTilesService(MBTILES_FILE)
-        print(f"MBTiles service initialized with: {MBTILES_FILE}")
+        log.info("MBTiles service initialized with: %s", MBTILES_FILE)
         metadata = mbtiles_service.get_metadata()
-        print(f"  Map name: {metadata.get('name', 'Unknown')}")
-        print(f"  Zoom range: {metadata.get('minzoom', 0)}-{metadata.get('maxzoom', 18)}")
-        print(f"  Format: {metadata.get('format', 'png')}")
+        log.info("  Map name: %s", metadata.get('name', 'Unknown'))
+        log.info("  Zoom range: %s-%s", metadata.get('minzoom', 0), metadata.get('maxzoom', 18))
+        log.info("  Format: %s", metadata.get('format', 'png'))
     else:
-        print(f"MBTiles file not found: {MBTILES_FILE}")
-        print(f"  Place .mbtiles files in: {os.path.dirname(MBTILES_FILE)}")
+        log.warning("MBTiles file not found: %s", MBTILES_FILE)
+        log.warning("  Place .mbtiles files in: %s", os.path.dirname(MBTILES_FILE))
 except Exception as e:
-    print(f"Error initializing MBTiles service: {e}")
+    log.error("Error initializing MBTiles service: %s", e)
 
 
 @tiles_bp.route('/<int:z>/<int:x>/<int:y>.<ext>')
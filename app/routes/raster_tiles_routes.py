@@ -5,6 +5,7 @@ Raster tiles serving routes for PNG/JPEG tiles
 from flask import Blueprint, Response, jsonify, request
 from flasgger import swag_from
 from pathlib import Path
+import logging
 import os
 import sys
 sys.path.append(str(Path(__file__).parent.parent))
@@ -13,6 +14,8 @@ from services.mbtiles_service import MBTilesService
 
 raster_tiles_bp = Blueprint('raster_tiles', __name__, url_prefix='/api/tiles/raster')
 
+log = logging.getLogger(__name__)
+
 # Path to raster MBTiles file (PNG/JPEG format)
 RASTER_MBTILES_FILE = os.path.join(os.path.dirname(__file__), '..', 'tiles', 'berlin-lowres-raster.mbtiles')
 
@@ -21,16 +24,16 @@ raster_tiles_service = None
 try:
     if os.path.exists(RASTER_MBTILES_FILE):
         raster_tiles_service = MBTilesService(RASTER_MBTILES_FILE)
-        print(f"Raster Tiles service initialized with: {RASTER_MBTILES_FILE}")
+        log.info("Raster Tiles service initialized with: %s", RASTER_MBTILES_FILE)
         metadata = raster_tiles_service.get_metadata()
-        print(f"  Map name: {metadata.get('name', 'Unknown')}")
-        print(f"  Zoom range: {metadata.get('minzoom', 0)}-{metadata.get('maxzoom', 18)}")
-        print(f"  Format: {metadata.get('format', 'png')}")
+        log.info("  Map name: %s", metadata.get('name', 'Unknown'))
+        log.info("  Zoom range: %s-%s", metadata.get('minzoom', 0), metadata.get('maxzoom', 18))
+        log.info("  Format: %s", metadata.get('format', 'png'))
     else:
-        print(f"Raster MBTiles file not found: {RASTER_MBTILES_FILE}")
-        print(f"  Place .mbtiles files in: {os.path.dirname(RASTER_MBTILES_FILE)}")
+        log.warning("Raster MBTiles file not found: %s", RASTER_MBTILES_FILE)
+        log.warning("  Place .mbtiles files in: %s", os.path.dirname(RASTER_MBTILES_FILE))
 except Exception as e:
-    print(f"Error initializing Raster Tiles service: {e}")
+    log.error("Error initializing Raster Tiles service: %s", e)
 
 
 @raster_tiles_bp.route('/<int:z>/<int:x>/<int:y>.<ext>')
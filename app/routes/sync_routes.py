@@ -2,23 +2,30 @@
 Sync API routes for mesh node synchronization
 """
 
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify, stream_with_context
 from flasgger import swag_from
 from marshmallow import ValidationError
 from apispec import APISpec
 from apispec.ext.marshmallow import MarshmallowPlugin
+import json
+import logging
 import sys
 from pathlib import Path
-from datetime import datetime, timezone
+import time
 
 sys.path.append(str(Path(__file__).parent.parent))
 
 from services.sync_service import get_sync_service
 from services.location_service import LocationService
+from utils.json_response import json_response
 
 sync_bp = Blueprint('sync', __name__, url_prefix='/api/sync')
 sync_service = get_sync_service()
 location_service = LocationService()
+log = logging.getLogger(__name__)
+
+# Largest page GET /api/sync returns; bigger limits are clamped to it
+SYNC_PAGE_MAX = 1000
 
 # Create APISpec instance for schema conversion (if needed)
 _apispec = APISpec(
@@ -29,11 +36,30 @@ _apispec = APISpec(
 )
 
 
+def _range_response(data: str) -> Response:
+    """
+    Wrap a JSON array from get_locations_in_range_json in the success envelope
+
+    Peers ask for the same unchanged window again on later cycles (e.g. an
+    empty backward window), so the body gets an ETag and a matching
+    If-None-Match is answered with a bodyless 304.
+    """
+    response = Response(
+        b'{"status":"success","data":' + data.encode() + b'}',
+        status=200,
+        mimetype='application/json'
+    )
+    response.add_etag()
+    return response.make_conditional(request)
+
+
 @sync_bp.route('', methods=['GET'])
 @swag_from({
     'tags': ['sync'],
     'summary': 'Get data since timestamp',
-    'description': 'Retrieve this node\'s data that is newer than the specified timestamp',
+    'description': 'Retrieve this node\'s data that is newer than the specified timestamp. '
+                   'In every response, paged or not, count comes after the data array in the body '
+                   '(rows are streamed, so the count is only known at the end).',
     'parameters': [
         {
             'name': 'since',
@@ -44,6 +70,27 @@ _apispec = APISpec(
             },
             'description': 'UTC milliseconds timestamp (optional, defaults to 0)',
             'default': 0
+        },
+        {
+            'name': 'limit',
+            'in': 'query',
+            'required': False,
+            'schema': {
+                'type': 'integer',
+                'minimum': 1
+            },
+            'description': f'Max reports to return (optional, values above {SYNC_PAGE_MAX} are clamped). '
+                           'Pages are ordered by created_at; pass next_since/next_after_id from the '
+                           'response to get the next page'
+        },
+        {
+            'name': 'after_id',
+            'in': 'query',
+            'required': False,
+            'schema': {
+                'type': 'string'
+            },
+            'description': 'id of the last report of the previous page (next_after_id); requires limit'
         }
     ],
     'responses': {
@@ -55,11 +102,13 @@ _apispec = APISpec(
                         'type': 'object',
                         'properties': {
                             'status': {'type': 'string', 'example': 'success'},
-                            'count': {'type': 'integer', 'example': 1},
                             'data': {
                                 'type': 'array',
                                 'items': {'type': 'object'}
-                            }
+                            },
+                            'count': {'type': 'integer', 'example': 1, 'description': 'Number of reports in data; follows data in the body'},
+                            'next_since': {'type': 'integer', 'nullable': True, 'description': 'With limit: since for the next page, null on the last page'},
+                            'next_after_id': {'type': 'string', 'nullable': True, 'description': 'With limit: after_id for the next page, null on the last page'}
                         }
                     }
                 }
@@ -85,6 +134,13 @@ def get_sync_data():
     """Get this node's data since a timestamp (for peers to pull)"""
     try:
         since = request.args.get('since', type=int, default=0)
+        limit = request.args.get('limit')
+        after_id = request.args.get('after_id')
+        
+        if limit is not None:
+            limit = _parse_limit(limit)
+        elif after_id is not None:
+            raise ValueError('after_id requires limit')
         
         # Get peer IP from request
         peer_ip = request.remote_addr
@@ -93,14 +149,20 @@ def get_sync_data():
         sync_service.log_incoming_sync_request(peer_ip)
         
         # Get data from sync service (default until to current time)
-        until = int(datetime.now(timezone.utc).timestamp() * 1000)
-        data = sync_service.get_own_data_since(since, until)
+        until = time.time_ns() // 1_000_000
         
-        return jsonify({
-            'status': 'success',
-            'count': len(data),
-            'data': data
-        })
+        if limit is not None:
+            rows = sync_service.get_own_data_page(since, limit, after_id, until)
+            return Response(_page_body(rows, limit), status=200, mimetype='application/json')
+        
+        data = sync_service.iter_own_data_since(since, until)
+        # Read the first row here so query errors still get an error response
+        # and the row iterator is started (closing it then closes its cursor)
+        first = next(data, None)
+        
+        # Stream the rows as they are read; count is only known at the end,
+        # so it follows the data array
+        return Response(stream_with_context(_stream_sync_data(first, data)), status=200, mimetype='application/json')
         
     except ValueError as e:
         return jsonify({
@@ -114,6 +176,53 @@ def get_sync_data():
         }), 500
 
 
+def _parse_limit(value: str) -> int:
+    """Parse the limit query parameter: a positive integer, clamped to SYNC_PAGE_MAX"""
+    try:
+        limit = int(value)
+    except ValueError:
+        raise ValueError('limit must be a positive integer') from None
+    if limit < 1:
+        raise ValueError('limit must be a positive integer')
+    return min(limit, SYNC_PAGE_MAX)
+
+
+def _page_body(rows, limit: int) -> str:
+    """Build the GET /api/sync response body for one keyset page"""
+    next_since = next_after_id = None
+    if len(rows) == limit:
+        next_since, next_after_id = rows[-1][0], rows[-1][1]
+    return (
+        '{"status":"success","data":[' + ','.join(row[2] for row in rows) + ']'
+        f',"count":{len(rows)},"next_since":{json.dumps(next_since)},"next_after_id":{json.dumps(next_after_id)}}}'
+    )
+
+
+def _stream_sync_data(first, data):
+    """
+    Yield the GET /api/sync response body around a stream of report JSON strings
+
+    first is the already-read first item (None if there are no rows). The
+    status is sent before the rows, so an error part-way through can only
+    be logged; the connection is dropped and the peer sees a cut-off body.
+    """
+    count = 0
+    try:
+        yield '{"status":"success","data":['
+        if first is not None:
+            yield first
+            count = 1
+            for item in data:
+                yield ',' + item
+                count += 1
+        yield f'],"count":{count}}}'
+    except Exception:
+        log.exception('GET /api/sync failed after streaming %d reports', count)
+        raise
+    finally:
+        data.close()
+
+
 @sync_bp.route('', methods=['POST'])
 @swag_from({
     'tags': ['sync'],
@@ -165,7 +274,7 @@ def trigger_sync():
         # Sync with all peers and get statistics
         stats = sync_service.sync_with_all_peers()
         
-        return jsonify({
+        return json_response({
             'status': 'success',
             **stats  # Include all statistics in response
         })
@@ -220,14 +329,10 @@ def trigger_sync():
 def get_node_list():
     """Get combined list of this node ID and all peer node IDs"""
     try:
-        my_node_id = sync_service.get_my_node_id()
-        peers = sync_service.get_all_peers()
-        peer_node_ids = list(peers.keys())
-        
-        # Combine my node ID with peer IDs
-        all_node_ids = [my_node_id] + peer_node_ids
-        
-        return jsonify({
+        # Combine my node ID with peer IDs (iterating the peers dict yields its keys)
+        all_node_ids = (sync_service.get_my_node_id(), *sync_service.get_all_peers())
+
+        return json_response({
             'status': 'success',
             'node_ids': all_node_ids
         })
@@ -239,7 +344,7 @@ def get_node_list():
         }), 500
 
 
-@sync_bp.route('/node/<node_id>/from/<from_timestamp>/to/<to_timestamp>', methods=['GET'])
+@sync_bp.route('/node/<node_id>/from/<int:from_timestamp>/to/<int:to_timestamp>', methods=['GET'])
 @swag_from({
     'tags': ['sync'],
     'summary': 'Get locations in range',
@@ -288,6 +393,9 @@ def get_node_list():
                 }
             }
         },
+        304: {
+            'description': 'Not modified (If-None-Match matched the current ETag)'
+        },
         500: {
             'description': 'Server error',
             'content': {
@@ -307,20 +415,17 @@ def get_node_list():
 def get_locations_in_range(node_id, from_timestamp, to_timestamp):
     """Get locations in range"""
     try:
-        locations = location_service.get_locations_in_range(node_id, int(from_timestamp), int(to_timestamp))
-        return jsonify({
-            'status': 'success',
-            'data': [l.to_dict() for l in locations]
-        }), 200
+        data = location_service.get_locations_in_range_json(node_id, from_timestamp, to_timestamp)
+        return _range_response(data)
     except Exception as e:
-        print(f'Server error on getting locations in range: {str(e)}')
+        log.exception('Server error on getting locations in range')
         return jsonify({
             'status': 'error',
             'message': f'Server error: {str(e)}'
         }), 500
 
 
-@sync_bp.route('/node/sync/from/<from_timestamp>/to/<to_timestamp>', methods=['GET'])
+@sync_bp.route('/node/sync/from/<int:from_timestamp>/to/<int:to_timestamp>', methods=['GET'])
 @swag_from({
     'tags': ['sync'],
     'summary': 'Get locations in range for sync',
@@ -361,6 +466,9 @@ def get_locations_in_range(node_id, from_timestamp, to_timestamp):
                 }
             }
         },
+        304: {
+            'description': 'Not modified (If-None-Match matched the current ETag)'
+        },
         500: {
             'description': 'Server error',
             'content': {
@@ -381,13 +489,10 @@ def get_locations_in_range_sync(from_timestamp, to_timestamp):
     """Get locations in range for sync"""
     try:
         node_id = sync_service.get_my_node_id()
-        locations = location_service.get_locations_in_range(node_id, int(from_timestamp), int(to_timestamp))
-        return jsonify({
-            'status': 'success',
-            'data': [l.to_dict() for l in locations]
-        }), 200
+        data = location_service.get_locations_in_range_json(node_id, from_timestamp, to_timestamp)
+        return _range_response(data)
     except Exception as e:
-        print(f'Server error on getting sync data: {str(e)}')
+        log.exception('Server error on getting sync data')
         return jsonify({
             'status': 'error',
             'message': f'Server error: {str(e)}'
@@ -463,7 +568,7 @@ def get_sync_status():
         if scheduler_status:
             response['scheduler'] = scheduler_status
         
-        return jsonify(response)
+        return json_response(response)
         
     except Exception as e:
         return jsonify({
@@ -5,14 +5,19 @@ Vector tiles serving routes for PBF/MVT tiles
 from flask import Blueprint, Response, jsonify, request
 from flasgger import swag_from
 from pathlib import Path
+import gzip
+import logging
 import os
 import sys
+import threading
 sys.path.append(str(Path(__file__).parent.parent))
 
 from services.vector_tiles_service import VectorTilesService
 
 vector_tiles_bp = Blueprint('vector_tiles', __name__, url_prefix='/api/tiles/vector')
 
+log = logging.getLogger(__name__)
+
 # Add CORS headers for all routes
 @vector_tiles_bp.after_request
 def add_cors_headers(response):
@@ -29,23 +34,33 @@ def handle_options(path):
 # Path to vector MBTiles file (PBF format)
 VECTOR_MBTILES_FILE = os.path.join(os.path.dirname(__file__), '..', 'tiles', 'berlin_tiles3.mbtiles')
 
+# Optional tile disk cache for deployments behind nginx.
+# When TILE_DISK_CACHE_DIR is set, tiles are written there gzip-compressed and
+# nginx serves the bytes via X-Accel-Redirect (see README for the nginx config).
+# The nginx location under TILE_ACCEL_REDIRECT_PREFIX must alias this directory.
+TILE_DISK_CACHE_DIR = os.environ.get('TILE_DISK_CACHE_DIR')
+TILE_ACCEL_REDIRECT_PREFIX = os.environ.get('TILE_ACCEL_REDIRECT_PREFIX', '/_tiles').rstrip('/')
+# Set by nginx.conf on proxied requests; requests reaching Waitress directly
+# (port 80/5000) have no nginx to follow the redirect and get the tile bytes
+TILE_ACCEL_REQUEST_HEADER = 'X-Nexum-Accel-Redirect'
+
 # Initialize service
 vector_tiles_service = None
 try:
     if os.path.exists(VECTOR_MBTILES_FILE):
         vector_tiles_service = VectorTilesService(VECTOR_MBTILES_FILE)
-        print(f"Vector Tiles service initialized with: {VECTOR_MBTILES_FILE}")
+        log.info("Vector Tiles service initialized with: %s", VECTOR_MBTILES_FILE)
         metadata = vector_tiles_service.get_metadata()
-        print(f"  Map name: {metadata.get('name', 'Unknown')}")
-        print(f"  Zoom range: {metadata.get('minzoom', 0)}-{metadata.get('maxzoom', 18)}")
-        print(f"  Format: {metadata.get('format', 'pbf')}")
+        log.info("  Map name: %s", metadata.get('name', 'Unknown'))
+        log.info("  Zoom range: %s-%s", metadata.get('minzoom', 0), metadata.get('maxzoom', 18))
+        log.info("  Format: %s", metadata.get('format', 'pbf'))
         if 'vector_layers' in metadata:
-            print(f"  Vector layers: {len(metadata['vector_layers'])} layers")
+            log.info("  Vector layers: %d layers", len(metadata['vector_layers']))
     else:
-        print(f"Vector MBTiles file not found: {VECTOR_MBTILES_FILE}")
-        print(f"  Place .mbtiles files in: {os.path.dirname(VECTOR_MBTILES_FILE)}")
+        log.warning("Vector MBTiles file not found: %s", VECTOR_MBTILES_FILE)
+        log.warning("  Place .mbtiles files in: %s", os.path.dirname(VECTOR_MBTILES_FILE))
 except Exception as e:
-    print(f"Error initializing Vector Tiles service: {e}")
+    log.error("Error initializing Vector Tiles service: %s", e)
 
 
 @vector_tiles_bp.route('/<int:z>/<int:x>/<int:y>.pbf')
@@ -125,6 +140,9 @@ def get_vector_tile(z: int, x: int, y: int):
     if z < minzoom or z > maxzoom:
         return Response(status=204)  # No Content - return empty for out of range
     
+    if TILE_DISK_CACHE_DIR and request.headers.get(TILE_ACCEL_REQUEST_HEADER):
+        return _accel_redirect_tile(z, x, y)
+    
     # Get tile data (automatically decompressed)
     tile_data = vector_tiles_service.get_tile(z, x, y, decompress=True)
     
@@ -142,6 +160,41 @@ def get_vector_tile(z: int, x: int, y: int):
     return response
 
 
+def _accel_redirect_tile(z: int, x: int, y: int):
+    """
+    Hand a vector tile off to nginx via X-Accel-Redirect
+    
+    Only used for requests proxied by nginx. On a cache miss the tile is
+    read from MBTiles and written to TILE_DISK_CACHE_DIR/{z}/{x}/{y}.pbf.gz;
+    the response body is left empty and nginx streams the cached file to
+    the client.
+    """
+    relative_path = f'{z}/{x}/{y}.pbf.gz'
+    cache_file = Path(TILE_DISK_CACHE_DIR) / relative_path
+    
+    if not cache_file.exists():
+        tile_data = vector_tiles_service.get_tile(z, x, y, decompress=False)
+        if tile_data is None:
+            return Response(status=204)  # No Content - tile doesn't exist
+        
+        # nginx always sends the cached file with Content-Encoding: gzip
+        if tile_data[:2] != b'\x1f\x8b':
+            tile_data = gzip.compress(tile_data)
+        
+        # Write to a per-thread temp file and rename so nginx never sees a partial tile
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = cache_file.with_name(f'{cache_file.name}.{os.getpid()}.{threading.get_ident()}.tmp')
+        tmp_file.write_bytes(tile_data)
+        tmp_file.replace(cache_file)
+    
+    response = Response(status=200)
+    response.headers['X-Accel-Redirect'] = f'{TILE_ACCEL_REDIRECT_PREFIX}/{relative_path}'
+    response.headers['Content-Type'] = 'application/x-protobuf'
+    response.headers['Content-Encoding'] = 'gzip'
+    response.headers['Cache-Control'] = 'public, max-age=31536000'  # Cache for 1 year
+    return response
+
+
 @vector_tiles_bp.route('/metadata')
 @swag_from({
     'tags': ['tiles'],
@@ -4,8 +4,10 @@
 # Environment variables:
 #   HOST - Host to bind to (default: 0.0.0.0)
 #   PORT - Port to bind to (default: 5000)
-#   WORKERS - Number of worker threads (default: 4)
-#   HTTPS - HTTPS control (default: auto-detect)
+#   THREADS - Number of Waitress worker threads (default: 32, WORKERS is still accepted)
+#   CONN_LIMIT - Maximum simultaneous connections (default: 1000)
+#   BACKLOG - Listen socket backlog (default: 2048)
+#   HTTPS - HTTPS control via nginx TLS termination, see nginx.conf (default: auto-detect)
 #     - HTTPS=true  - Force HTTPS (requires cert.pem and key.pem)
 #     - HTTPS=false - Force HTTP (ignore certificates)
 #     - HTTPS=""    - Auto-detect (use HTTPS if certificates exist)
@@ -21,7 +23,7 @@ if (-not $env:FLASK_ENV) {
 # Set defaults if not provided
 if (-not $env:HOST) { $env:HOST = "0.0.0.0" }
 if (-not $env:PORT) { $env:PORT = "5000" }
-if (-not $env:WORKERS) { $env:WORKERS = "4" }
+if (-not $env:THREADS) { $env:THREADS = if ($env:WORKERS) { $env:WORKERS } else { "32" } }
 
 # HTTPS control:
 #   HTTPS=true  - Force HTTPS (requires cert.pem and key.pem)
@@ -41,7 +43,7 @@ Write-Host "Nexum Mesh Messaging - Production Mode" -ForegroundColor Cyan
 Write-Host "========================================" -ForegroundColor Cyan
 Write-Host "Host: $env:HOST" -ForegroundColor Yellow
 Write-Host "Port: $env:PORT" -ForegroundColor Yellow
-Write-Host "Workers: $env:WORKERS" -ForegroundColor Yellow
+Write-Host "Threads: $env:THREADS" -ForegroundColor Yellow
 Write-Host "Environment: $env:FLASK_ENV" -ForegroundColor Yellow
 Write-Host ""
 
@@ -4,14 +4,19 @@
 # Environment variables:
 #   HOST - Host to bind to (default: 0.0.0.0)
 #   PORT - Port to bind to (default: 5000)
-#   WORKERS - Number of worker threads (default: 4)
-#   HTTPS - HTTPS control (default: auto-detect)
+#   THREADS - Number of Waitress worker threads (default: 32, WORKERS is still accepted)
+#   CONN_LIMIT - Maximum simultaneous connections (default: 1000)
+#   BACKLOG - Listen socket backlog (default: 2048)
+#   HTTPS - HTTPS control via nginx TLS termination, see nginx.conf (default: auto-detect)
 #     - HTTPS=true  - Force HTTPS (requires cert.pem and key.pem)
 #     - HTTPS=false - Force HTTP (ignore certificates)
 #     - HTTPS=""    - Auto-detect (use HTTPS if certificates exist)
 #   SYNC_ENABLED - Enable sync scheduler (default: true)
 #   SYNC_INTERVAL_SECONDS - Sync interval in seconds (default: 10)
 #   FLASK_ENV - Flask environment (default: production)
+#   LOG_FILE - Rotating application log file (default: data/nexum.log)
+#   LOG_LEVEL - Application log level (default: INFO)
+#   QUIET - Set to skip the startup banner printed by run_production.py
 
 # Set production environment
 export FLASK_ENV="${FLASK_ENV:-production}"
@@ -19,7 +24,8 @@ export FLASK_ENV="${FLASK_ENV:-production}"
 # Get configuration from environment or use defaults
 HOST="${HOST:-0.0.0.0}"
 PORT="${PORT:-5000}"
-WORKERS="${WORKERS:-4}"
+THREADS="${THREADS:-${WORKERS:-32}}"
+export THREADS
 
 # HTTPS control:
 #   HTTPS=true  - Force HTTPS (requires cert.pem and key.pem)
@@ -36,7 +42,7 @@ echo "Nexum Mesh Messaging - Production Mode"
 echo "========================================"
 echo "Host: $HOST"
 echo "Port: $PORT"
-echo "Workers: $WORKERS"
+echo "Threads: $THREADS"
 echo "Environment: $FLASK_ENV"
 echo ""
 
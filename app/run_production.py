@@ -2,25 +2,74 @@
 """
 Production server runner for Nexum Mesh Messaging
 Uses Waitress WSGI server for production deployment
-Automatically enables HTTPS if SSL certificate files are present
+HTTPS is terminated by nginx in front of Waitress (see nginx.conf)
 """
 
+import atexit
+import logging
 import os
+import queue
+import shutil
 import sys
-import ssl
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
 
 # Add app directory to path
 sys.path.insert(0, str(Path(__file__).parent.resolve()))
 
-from waitress import serve
-from app import app
+log = logging.getLogger(__name__)
+
+# Waitress options shared by every start (pool sizing comes from the environment)
+WAITRESS_KWARGS = dict(
+    channel_timeout=60,
+    cleanup_interval=30,
+    asyncore_use_poll=True,
+    ident='nexum',
+)
+
+
+def configure_logging(log_file: Path, level: str = 'INFO'):
+    """Send application logs to a size-rotated file instead of the console, off the calling threads"""
+    log_file.parent.mkdir(parents=True, exist_ok=True)
+    handler = RotatingFileHandler(log_file, maxBytes=5 * 1024 * 1024, backupCount=3)
+    handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(name)s: %(message)s'))
+    # Request and sync threads only enqueue records; formatting and file
+    # writes happen on the listener's thread
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, handler)
+    listener.start()
+    atexit.register(listener.stop)
+    root = logging.getLogger()
+    root.addHandler(QueueHandler(log_queue))
+    root.setLevel(level.upper())
+
+
+def _nginx_installed() -> bool:
+    """True if an nginx binary is present to terminate TLS (see nginx.conf)"""
+    search_path = os.pathsep.join([os.environ.get('PATH', ''), '/usr/sbin', '/usr/local/sbin'])
+    return shutil.which('nginx', path=search_path) is not None
+
+
+def _start_http(host: str, port: int, **options):
+    """Serve the app with Waitress over plain HTTP (TLS is terminated by nginx)"""
+    from waitress import serve
+    serve(app, host=host, port=port, **WAITRESS_KWARGS, **options)
+
 
 if __name__ == '__main__':
     # Get configuration from environment or use defaults
     host = os.environ.get('HOST', '0.0.0.0')
     port = int(os.environ.get('PORT', 5000))
-    workers = int(os.environ.get('WORKERS', 4))
+    # Waitress is a single process; THREADS sizes its worker pool (WORKERS is the old name)
+    threads = int(os.environ.get('THREADS') or os.environ.get('WORKERS') or 32)
+    connection_limit = int(os.environ.get('CONN_LIMIT', 1000))
+    backlog = int(os.environ.get('BACKLOG', 2048))
+    # QUIET=1 skips the startup banner
+    echo = (lambda *args: None) if os.environ.get('QUIET') else print
+    log_file = Path(os.environ.get('LOG_FILE', Path(__file__).parent.resolve() / 'data' / 'nexum.log'))
+    configure_logging(log_file, os.environ.get('LOG_LEVEL', 'INFO'))
+    # Imported after logging is configured so the services' startup logs are kept
+    from app import app
     
     # Set Flask environment if not already set
     if 'FLASK_ENV' not in os.environ:
@@ -40,106 +89,105 @@ if __name__ == '__main__':
     else:
         # Auto-detect: Use HTTPS if certificate files exist
         use_https = cert_file.exists() and key_file.exists()
+    # Waitress only speaks HTTP; without nginx nothing listens for HTTPS
+    nginx_found = _nginx_installed()
     
-    print('=' * 50)
-    print('Nexum Mesh Messaging - Production Mode')
-    print('=' * 50)
-    print(f'Host: {host}')
-    print(f'Port: {port}')
-    print(f'Workers: {workers}')
-    print(f'Environment: {os.environ.get("FLASK_ENV", "production")}')
-    print(f'HTTPS: {"Enabled" if use_https else "Disabled"}')
+    echo('=' * 50)
+    echo('Nexum Mesh Messaging - Production Mode')
+    echo('=' * 50)
+    echo(f'Host: {host}')
+    echo(f'Port: {port}')
+    echo(f'Threads: {threads}')
+    echo(f'Connection limit: {connection_limit}')
+    echo(f'Backlog: {backlog}')
+    echo(f'Log file: {log_file}')
+    echo(f'Environment: {os.environ.get("FLASK_ENV", "production")}')
+    if use_https and not nginx_found:
+        echo('HTTPS: Disabled (nginx not installed)')
+    else:
+        echo(f'HTTPS: {"Enabled" if use_https else "Disabled"}')
     
     if use_https:
         if not cert_file.exists() or not key_file.exists():
-            print('')
-            print('❌ ERROR: HTTPS enabled but certificate files not found!')
-            print(f'   Expected: {cert_file}')
-            print(f'   Expected: {key_file}')
-            print('   To generate certificates:')
-            print('     openssl req -x509 -newkey rsa:4096 -nodes -out cert.pem -keyout key.pem -days 365 -subj "/CN=nexum"')
-            print('')
-            print('Falling back to HTTP...')
+            echo('')
+            echo('❌ ERROR: HTTPS enabled but certificate files not found!')
+            echo(f'   Expected: {cert_file}')
+            echo(f'   Expected: {key_file}')
+            echo('   To generate certificates:')
+            echo('     openssl req -x509 -newkey rsa:4096 -nodes -out cert.pem -keyout key.pem -days 365 -subj "/CN=nexum"')
+            echo('')
+            echo('Falling back to HTTP...')
+            use_https = False
+        elif not nginx_found:
+            echo('')
+            echo('⚠️  WARNING: HTTPS requested but nginx is not installed!')
+            echo('   Waitress serves plain HTTP only, so nothing will answer on port 443.')
+            echo('   To enable HTTPS:')
+            echo('     sudo apt-get install nginx')
+            echo(f'     sudo cp {app_dir / "nginx.conf"} /etc/nginx/sites-available/nexum')
+            echo('     sudo ln -s /etc/nginx/sites-available/nexum /etc/nginx/sites-enabled/nexum')
+            echo('     sudo nginx -t && sudo systemctl reload nginx')
+            echo('')
+            echo('Falling back to HTTP...')
+            # Also logged, since QUIET=1 hides the banner
+            log.warning('HTTPS requested but nginx is not installed; serving plain HTTP only')
             use_https = False
         else:
-            print(f'Certificate: {cert_file}')
-            print(f'Private Key: {key_file}')
+            echo(f'Certificate: {cert_file}')
+            echo(f'Private Key: {key_file}')
             if https_env:
-                print(f'HTTPS mode: Explicitly set to {https_env}')
+                echo(f'HTTPS mode: Explicitly set to {https_env}')
             else:
-                print('HTTPS mode: Auto-detected (certificates found)')
-            print('')
-            print('⚠️  Using self-signed certificate')
-            print('   Browsers will show a security warning on first visit.')
-            print('   Users need to click "Advanced" → "Proceed anyway"')
-            print('   This is normal for mesh networks without a certificate authority.')
+                echo('HTTPS mode: Auto-detected (certificates found)')
+            echo('')
+            echo('ℹ️  TLS is terminated by nginx on port 443 (see nginx.conf)')
+            echo(f'   nginx proxies to Waitress on http://127.0.0.1:{port}')
+            echo('   Mesh peers keep syncing over plain HTTP on this port.')
+            echo('')
+            echo('⚠️  Using self-signed certificate')
+            echo('   Browsers will show a security warning on first visit.')
+            echo('   Users need to click "Advanced" → "Proceed anyway"')
+            echo('   This is normal for mesh networks without a certificate authority.')
     else:
-        print('')
+        echo('')
         if https_env == 'false':
-            print('ℹ️  HTTPS explicitly disabled (HTTPS=false)')
+            echo('ℹ️  HTTPS explicitly disabled (HTTPS=false)')
         else:
-            print('ℹ️  HTTPS disabled (cert.pem and key.pem not found)')
-        print('   GPS geolocation will not work on HTTP sites.')
-        print('   To enable HTTPS:')
-        print('     1. Generate certificate:')
-        print('        openssl req -x509 -newkey rsa:4096 -nodes -out cert.pem -keyout key.pem -days 365 -subj "/CN=nexum"')
-        print('     2. Or set HTTPS=true to force HTTPS mode')
+            echo('ℹ️  HTTPS disabled (cert.pem and key.pem not found)')
+        echo('   GPS geolocation will not work on HTTP sites.')
+        echo('   To enable HTTPS:')
+        echo('     1. Generate certificate:')
+        echo('        openssl req -x509 -newkey rsa:4096 -nodes -out cert.pem -keyout key.pem -days 365 -subj "/CN=nexum"')
+        echo('     2. Install nginx with nginx.conf to terminate TLS on port 443')
+        echo('     3. Or set HTTPS=true to force HTTPS mode')
     
-    print('')
-    print('Starting Waitress WSGI server...')
+    echo('')
+    echo('Starting Waitress WSGI server...')
+    echo(f'Server will be available at http://{host}:{port}')
+    if use_https:
+        echo('           (and https://<node>/ through nginx)')
+    echo('Press Ctrl+C to stop the server')
+    echo('')
     
+    # Waitress has no TLS support; when HTTPS is on, trust nginx on localhost
+    # to report the original scheme and client address
+    proxy_options = {}
     if use_https:
-        print(f'Server will be available at https://{host}:{port}')
-        print(f'           (or https://localhost:{port} for local access)')
-        
-        # Waitress doesn't support SSL directly, so we need to use a workaround
-        # We'll use Flask's built-in server with SSL for HTTPS, or use a reverse proxy
-        # For simplicity, we'll use Flask's server with SSL when HTTPS is needed
-        print('')
-        print('Note: Using Flask development server for HTTPS support')
-        print('      (Waitress doesn\'t support SSL natively)')
-        print('')
-        
-        # Load SSL context
-        try:
-            context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
-            context.load_cert_chain(str(cert_file), str(key_file))
-            
-            # Use Flask's built-in server with SSL
-            app.run(
-                host=host,
-                port=port,
-                debug=False,
-                ssl_context=context,
-                threaded=True
-            )
-        except Exception as e:
-            print(f'Error loading SSL certificate: {e}')
-            print('Falling back to HTTP...')
-            print(f'Server will be available at http://{host}:{port}')
-            print('Press Ctrl+C to stop the server')
-            print('')
-            serve(
-                app,
-                host=host,
-                port=port,
-                threads=workers,
-                channel_timeout=120,
-                cleanup_interval=30,
-                asyncore_use_poll=True
-            )
-    else:
-        print(f'Server will be available at http://{host}:{port}')
-        print('Press Ctrl+C to stop the server')
-        print('')
-        
-        serve(
-            app,
-            host=host,
-            port=port,
-            threads=workers,
-            channel_timeout=120,
-            cleanup_interval=30,
-            asyncore_use_poll=True
+        proxy_options = {
+            'trusted_proxy': '127.0.0.1',
+            'trusted_proxy_headers': {'x-forwarded-proto', 'x-forwarded-for'},
+        }
+    
+    try:
+        _start_http(
+            host,
+            port,
+            threads=threads,
+            connection_limit=connection_limit,
+            backlog=backlog,
+            **proxy_options
         )
-
+    finally:
+        # Checkpoint the WAL so the database file is complete on its own
+        from services.sync_service import get_sync_service
+        get_sync_service().close()
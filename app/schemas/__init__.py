@@ -13,7 +13,15 @@ from .location_schemas import (
     NearbyResponseSchema,
     EntityTypesResponseSchema,
     NodeIdResponseSchema,
-    HealthResponseSchema
+    HealthResponseSchema,
+    position_schema,
+    location_request_schema,
+    location_response_schema,
+    location_list_schema,
+    nearby_request_schema,
+    nearby_response_schema,
+    entity_types_schema,
+    node_id_schema
 )
 
 __all__ = [
@@ -27,6 +35,14 @@ __all__ = [
     'NearbyResponseSchema',
     'EntityTypesResponseSchema',
     'NodeIdResponseSchema',
-    'HealthResponseSchema'
+    'HealthResponseSchema',
+    'position_schema',
+    'location_request_schema',
+    'location_response_schema',
+    'location_list_schema',
+    'nearby_request_schema',
+    'nearby_response_schema',
+    'entity_types_schema',
+    'node_id_schema'
 ]
 
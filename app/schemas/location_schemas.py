@@ -5,9 +5,10 @@ These schemas define the request/response DTOs and are automatically used by Swa
 
 from marshmallow import Schema, fields, validate
 from flasgger import Schema as SwaggerSchema
-from enum import Enum
+from enum import Enum, unique
 
 
+@unique
 class EntityTypeEnum(str, Enum):
     """Entity type enumeration"""
     RESPONDER = "responder"
@@ -17,6 +18,10 @@ class EntityTypeEnum(str, Enum):
     HAZARD = "hazard"
 
 
+# Valid entity_type strings, shared by the OneOf validators below
+ENTITY_TYPE_VALUES = tuple(e.value for e in EntityTypeEnum)
+
+
 class PositionSchema(Schema):
     """Position/geolocation schema"""
     lat = fields.Float(required=True, description="Latitude", example=52.5200)
@@ -29,7 +34,7 @@ class LocationRequestSchema(Schema):
     """Request schema for adding a location"""
     entity_type = fields.Str(
         required=True,
-        validate=validate.OneOf([e.value for e in EntityTypeEnum]),
+        validate=validate.OneOf(ENTITY_TYPE_VALUES),
         description="Type of entity",
         example="responder"
     )
@@ -108,7 +113,7 @@ class NearbyRequestSchema(Schema):
     entity_type = fields.Str(
         required=False,
         allow_none=True,
-        validate=validate.OneOf([e.value for e in EntityTypeEnum]),
+        validate=validate.OneOf(ENTITY_TYPE_VALUES),
         description="Filter by entity type (optional)",
         example="resource"
     )
@@ -127,7 +132,7 @@ class EntityTypesResponseSchema(Schema):
     """Response schema for entity types list"""
     status = fields.Str(description="Response status", example="success")
     data = fields.List(
-        fields.Str(validate=validate.OneOf([e.value for e in EntityTypeEnum])),
+        fields.Str(validate=validate.OneOf(ENTITY_TYPE_VALUES)),
         description="List of valid entity types",
         example=["responder", "civilian", "incident", "resource", "hazard"]
     )
@@ -144,3 +149,13 @@ class HealthResponseSchema(Schema):
     status = fields.Str(description="Service status", example="healthy")
     timestamp = fields.DateTime(description="Current timestamp")
 
+
+# Shared schema instances, built once at import time for use by the route handlers
+position_schema = PositionSchema()
+location_request_schema = LocationRequestSchema()
+location_response_schema = LocationSuccessResponseSchema()
+location_list_schema = LocationListResponseSchema()
+nearby_request_schema = NearbyRequestSchema()
+nearby_response_schema = NearbyResponseSchema()
+entity_types_schema = EntityTypesResponseSchema()
+node_id_schema = NodeIdResponseSchema()
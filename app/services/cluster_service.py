@@ -2,16 +2,44 @@
 Cluster service for node identification and mesh network management
 """
 
+import logging
+import os
+import socket
+import struct
 import subprocess
 import platform
+import threading
+import uuid
 from pathlib import Path
 
+try:
+    import fcntl  # Unix only
+except ImportError:
+    fcntl = None
+
+log = logging.getLogger(__name__)
+
+# Resolved node ID is cached here so restarts skip interface probing.
+# /var/run is cleared on reboot, so a changed NIC is picked up after a restart.
+NODE_ID_CACHE_FILE = Path(os.environ.get('NODE_ID_CACHE_FILE', '/var/run/nexum-node-id'))
+
+PLACEHOLDER_MAC = '00:00:00:00:00:00'
+
+# ioctl request for an interface's hardware address (linux/sockios.h)
+SIOCGIFHWADDR = 0x8927
+# sa_family of an Ethernet-style (incl. WiFi) hardware address (linux/if_arp.h)
+ARPHRD_ETHER = 1
+
 
 class ClusterService:
     """Service for cluster/node identification and management"""
     
     def __init__(self):
         self._node_id = None
+        try:
+            self._node_id = NODE_ID_CACHE_FILE.read_text().strip() or None
+        except OSError:
+            pass
     
     def get_current_node_id(self) -> str:
         """
@@ -46,9 +74,14 @@ class ClusterService:
         if not node_id:
             node_id = self._get_mac_system()
         
-        # Cache the result
+        # Cache the result (persist real MACs only, never the placeholder)
         self._node_id = node_id
-        print(f"ClusterService: Node ID determined: {node_id}")
+        if node_id != PLACEHOLDER_MAC:
+            try:
+                NODE_ID_CACHE_FILE.write_text(node_id)
+            except OSError:
+                pass
+        log.info("Node ID determined: %s", node_id)
         return node_id
     
     def _get_mac_from_interface(self, interface: str) -> str:
@@ -75,7 +108,7 @@ class ClusterService:
                 mac_file = Path(f'/sys/class/net/{interface}/address')
                 if mac_file.exists():
                     mac = mac_file.read_text().strip()
-                    if mac and mac != '00:00:00:00:00:00':
+                    if mac and mac != PLACEHOLDER_MAC:
                         return mac
         except Exception:
             pass
@@ -83,46 +116,35 @@ class ClusterService:
         return None
     
     def _get_mac_system(self) -> str:
-        """Get MAC address using system commands"""
+        """Get MAC address of the first interface with a real hardware address"""
         try:
-            if platform.system() == 'Windows':
-                # Windows: use ipconfig
-                result = subprocess.run(
-                    ['ipconfig', '/all'],
-                    capture_output=True,
-                    text=True,
-                    timeout=5
-                )
-                if result.returncode == 0:
-                    # Find first non-zero MAC address
-                    for line in result.stdout.split('\n'):
-                        if 'Physical Address' in line or 'MAC Address' in line:
-                            parts = line.split(':')
-                            if len(parts) > 1:
-                                mac = parts[-1].strip().replace('-', ':')
-                                if mac and mac != '00:00:00:00:00:00':
-                                    return mac
+            if platform.system() == 'Linux':
+                # Linux: SIOCGIFHWADDR ioctl per interface in ifindex order (no subprocess)
+                with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+                    for _, interface in socket.if_nameindex():
+                        try:
+                            info = fcntl.ioctl(sock.fileno(), SIOCGIFHWADDR,
+                                               struct.pack('256s', interface[:15].encode()))
+                        except OSError:
+                            continue
+                        # struct ifreq: 16-byte name, then the sockaddr's sa_family
+                        # and address; skips loopback, tunnels and other non-Ethernet links
+                        if struct.unpack_from('H', info, 16)[0] != ARPHRD_ETHER:
+                            continue
+                        mac = ':'.join('%02x' % b for b in info[18:24])
+                        if mac != PLACEHOLDER_MAC:
+                            return mac
             else:
-                # Linux: use ip link
-                result = subprocess.run(
-                    ['ip', 'link', 'show'],
-                    capture_output=True,
-                    text=True,
-                    timeout=5
-                )
-                if result.returncode == 0:
-                    for line in result.stdout.split('\n'):
-                        if 'link/ether' in line:
-                            parts = line.split('link/ether')
-                            if len(parts) > 1:
-                                mac = parts[1].strip().split()[0]
-                                if mac and mac != '00:00:00:00:00:00':
-                                    return mac
+                # Windows/macOS: uuid.getnode() reads the hardware address in-process.
+                # If it can't, it returns a random number with the multicast bit set.
+                node = uuid.getnode()
+                if not (node >> 40) & 1:
+                    return ':'.join('%02x' % b for b in node.to_bytes(6, 'big'))
         except Exception:
             pass
         
         # Ultimate fallback: return a placeholder
-        return '00:00:00:00:00:00'
+        return PLACEHOLDER_MAC
     
     def get_node_id_formatted(self) -> str:
         """
@@ -136,11 +158,15 @@ class ClusterService:
 
 # Singleton instance
 _cluster_service = None
+_cluster_service_lock = threading.Lock()
 
 def get_cluster_service() -> ClusterService:
     """Get the singleton ClusterService instance"""
     global _cluster_service
     if _cluster_service is None:
-        _cluster_service = ClusterService()
+        # Double-checked so concurrent first callers don't each build one
+        with _cluster_service_lock:
+            if _cluster_service is None:
+                _cluster_service = ClusterService()
     return _cluster_service
 
@@ -0,0 +1,94 @@
+"""
+SQLite connection handling shared by the database-backed services
+"""
+
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+# Per-connection compiled statement cache (sqlite3 default is 128)
+CACHED_STATEMENTS = 256
+
+# Applied once to every connection opened by get_connection()
+CONNECTION_PRAGMAS = (
+    'PRAGMA journal_mode=WAL',
+    'PRAGMA synchronous=NORMAL',
+    'PRAGMA wal_autocheckpoint=1000',
+    'PRAGMA busy_timeout=5000',
+    'PRAGMA temp_store=MEMORY',
+    'PRAGMA mmap_size=268435456',
+    'PRAGMA cache_size=-65536',
+)
+
+# For databases that are only ever read (MBTiles): no journal mode change,
+# which would need write access to the file, and a larger mmap window so
+# blobs are read straight from the page cache
+READ_ONLY_PRAGMAS = (
+    'PRAGMA temp_store=MEMORY',
+    'PRAGMA mmap_size=1073741824',
+    'PRAGMA cache_size=-65536',
+)
+
+_local = threading.local()
+
+
+def get_connection(db_path: str, pragmas: tuple = CONNECTION_PRAGMAS, uri: bool = False) -> sqlite3.Connection:
+    """
+    Get this thread's connection to a database, opening it on first use
+
+    Connections are cached per thread (Waitress reuses its worker threads),
+    so each thread pays the open/PRAGMA cost once. They run in autocommit
+    mode; use transaction() to group several writes.
+
+    Args:
+        db_path: Path to the SQLite database file
+        pragmas: PRAGMA statements to run when the connection is opened
+        uri: Whether db_path is a file: URI (e.g. with ?mode=ro)
+
+    Returns:
+        sqlite3.Connection with row_factory set to sqlite3.Row
+    """
+    connections = getattr(_local, 'connections', None)
+    if connections is None:
+        connections = _local.connections = {}
+
+    conn = connections.get(db_path)
+    if conn is None:
+        conn = sqlite3.connect(db_path, isolation_level=None, check_same_thread=False,
+                               cached_statements=CACHED_STATEMENTS, uri=uri)
+        conn.row_factory = sqlite3.Row
+        for pragma in pragmas:
+            conn.execute(pragma)
+        connections[db_path] = conn
+    return conn
+
+
+@contextmanager
+def transaction(conn: sqlite3.Connection):
+    """
+    Run the enclosed statements in a single BEGIN IMMEDIATE ... COMMIT
+
+    Rolls back if the statements or the COMMIT itself fail (e.g. SQLITE_BUSY),
+    so the cached connection is never left inside an open transaction.
+    """
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        yield conn
+        conn.execute('COMMIT')
+    except BaseException:
+        # Some errors already rolled the transaction back
+        if conn.in_transaction:
+            conn.execute('ROLLBACK')
+        raise
+
+
+def read_only_uri(db_path) -> str:
+    """
+    Build a URI that opens a database read-only and immutable
+
+    immutable=1 makes SQLite skip file locking and WAL/journal handling
+    entirely, so it must only be used for files nothing writes to while
+    they are open (e.g. MBTiles).
+    """
+    return f"{Path(db_path).resolve().as_uri()}?mode=ro&immutable=1"
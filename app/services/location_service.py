@@ -4,15 +4,237 @@ Location tracking service for disaster relief operations
 
 import sqlite3
 import json
-from typing import List, Optional, Tuple
+import logging
+import queue
+import threading
+from contextlib import nullcontext
+from typing import Iterator, List, Optional, Tuple
 from uuid import UUID
 from pathlib import Path
 
 import sys
 sys.path.append(str(Path(__file__).parent.parent))
 
+# Optional import for orjson (faster metadata serialization, falls back to json)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from models.location import LocationReport, EntityType, GeoLocation
 from services.cluster_service import get_cluster_service
+from services.database import get_connection, transaction
+
+
+log = logging.getLogger(__name__)
+
+# Single-row writes queued for group commit: max pending, max rows per commit
+WRITE_QUEUE_SIZE = 10000
+WRITE_BATCH_SIZE = 500
+# Seconds a caller waits for its queued row to be committed
+WRITE_TIMEOUT = 30
+
+# Rows fetched per step when streaming query results
+STREAM_BATCH_SIZE = 500
+
+# Shared by add_location and add_locations_batch so the connection's
+# statement cache reuses one compiled INSERT
+_INSERT_LOCATION_SQL = '''
+    INSERT INTO location_reports (
+        id, entity_type, entity_id, node_id,
+        latitude, longitude, altitude, accuracy,
+        created_at, metadata
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(id) DO NOTHING
+'''
+
+
+def _json_real(column: str) -> str:
+    """
+    SQL rendering a REAL column as a JSON number without losing precision
+    
+    json_object() writes REALs with 15 significant digits, which changes
+    coordinates such as 52.52000659999999; 17 digits round-trip a double.
+    """
+    return f"json(CASE WHEN {column} IS NULL THEN 'null' ELSE printf('%!.17g', {column}) END)"
+
+
+# SQLite JSON1 expression producing the LocationReport.to_dict() shape for a row
+_REPORT_JSON_OBJECT = f'''json_object(
+    'id', id,
+    'entity_type', entity_type,
+    'entity_id', entity_id,
+    'node_id', node_id,
+    'position', json_object(
+        'lat', {_json_real('latitude')},
+        'lon', {_json_real('longitude')},
+        'alt', {_json_real('altitude')},
+        'accuracy', {_json_real('accuracy')}
+    ),
+    'created_at', created_at,
+    'metadata', CASE WHEN json_valid(metadata) THEN json(metadata) ELSE json_object() END
+)'''
+
+
+def _iter_first_column(cursor: sqlite3.Cursor) -> Iterator:
+    """
+    Yield the first column of every row, fetching STREAM_BATCH_SIZE rows at a time
+
+    The cursor is closed when the rows run out or the generator is closed,
+    so an abandoned stream doesn't keep the connection's read snapshot open.
+    """
+    try:
+        while True:
+            rows = cursor.fetchmany(STREAM_BATCH_SIZE)
+            if not rows:
+                return
+            for row in rows:
+                yield row[0]
+    finally:
+        cursor.close()
+
+
+def _dumps_metadata(metadata: dict) -> str:
+    """Serialize a metadata dict to the JSON text stored in location_reports"""
+    if not metadata:
+        return '{}'
+    if orjson is not None:
+        return orjson.dumps(metadata, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(metadata)
+
+
+def _report_to_row(report: LocationReport) -> tuple:
+    """Convert a LocationReport to the parameter tuple for _INSERT_LOCATION_SQL"""
+    return (
+        str(report.id),
+        report.entity_type.value,
+        str(report.entity_id),
+        report.node_id,
+        report.position.latitude,
+        report.position.longitude,
+        report.position.altitude,
+        report.position.accuracy,
+        report.created_at,
+        _dumps_metadata(report.metadata)  # Store as JSON string
+    )
+
+
+class _PendingWrite:
+    """A queued insert and the event its caller waits on"""
+    __slots__ = ('row', 'done', 'error', 'claimed', 'cancelled')
+    
+    def __init__(self, row: tuple):
+        self.row = row
+        self.done = threading.Event()
+        self.error = None
+        # Set under _LocationWriter._claim_lock: claimed once the writer takes
+        # the row into a batch, cancelled if its caller timed out before that
+        self.claimed = False
+        self.cancelled = False
+
+
+class _LocationWriter:
+    """
+    Background thread that commits queued single-row inserts together
+    
+    Concurrent add_location calls would otherwise each run (and sync) their
+    own transaction. Rows that arrive while a commit is in progress are
+    written by the next one in a single executemany, so a burst costs a
+    handful of commits instead of one per report. Callers still block until
+    their row is committed.
+    """
+    
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._queue = queue.Queue(maxsize=WRITE_QUEUE_SIZE)
+        self._claim_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name='location-writer', daemon=True)
+        self._thread.start()
+    
+    def write(self, row: tuple):
+        """
+        Queue a row for insertion and wait until it is committed
+        
+        Raises TimeoutError if the writer has not started on the row within
+        WRITE_TIMEOUT seconds; the row is then cancelled and never written, so
+        the caller can safely retry. A row the writer has already taken is
+        waited on until its commit finishes.
+        """
+        pending = _PendingWrite(row)
+        try:
+            self._queue.put(pending, timeout=WRITE_TIMEOUT)
+        except queue.Full:
+            raise TimeoutError('Location write queue is full') from None
+        if not pending.done.wait(WRITE_TIMEOUT):
+            with self._claim_lock:
+                if not pending.claimed:
+                    pending.cancelled = True
+                    raise TimeoutError(f'Location write not started within {WRITE_TIMEOUT}s')
+            # Its commit is bounded by busy_timeout, so this wait ends
+            pending.done.wait()
+        if pending.error is not None:
+            raise pending.error
+    
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            try:
+                while len(batch) < WRITE_BATCH_SIZE:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                pass
+            
+            # Skip rows whose callers already gave up on them
+            with self._claim_lock:
+                batch = [pending for pending in batch if not pending.cancelled]
+                for pending in batch:
+                    pending.claimed = True
+            if not batch:
+                continue
+            
+            try:
+                self._write_batch(batch)
+            except Exception as e:
+                # e.g. the database can't be opened; fail this batch and
+                # keep the thread alive for the next one
+                for pending in batch:
+                    pending.error = e
+            finally:
+                for pending in batch:
+                    pending.done.set()
+    
+    def _write_batch(self, batch: List[_PendingWrite]):
+        """Insert a batch in one transaction, falling back to one row at a time"""
+        conn = get_connection(self.db_path)
+        try:
+            with transaction(conn):
+                conn.executemany(_INSERT_LOCATION_SQL, [pending.row for pending in batch])
+        except sqlite3.IntegrityError:
+            # A bad row fails the whole executemany; retry one by one, still in
+            # a single transaction, so only the offending callers get the error.
+            # Other errors (e.g. a locked database) fail the batch as a whole
+            # rather than waiting out busy_timeout once per row.
+            with transaction(conn):
+                for pending in batch:
+                    try:
+                        conn.execute(_INSERT_LOCATION_SQL, pending.row)
+                    except sqlite3.IntegrityError as e:
+                        pending.error = e
+
+
+_writers = {}
+_writers_lock = threading.Lock()
+
+
+def _get_writer(db_path: str) -> _LocationWriter:
+    """Get the group-commit writer for a database, starting it on first use"""
+    writer = _writers.get(db_path)
+    if writer is None:
+        with _writers_lock:
+            writer = _writers.get(db_path)
+            if writer is None:
+                writer = _writers[db_path] = _LocationWriter(db_path)
+    return writer
 
 
 class LocationService:
@@ -26,6 +248,10 @@ class LocationService:
         self.cluster_service = get_cluster_service()
         # Schema is now managed by migrations in app/migrations/
     
+    def _conn(self) -> sqlite3.Connection:
+        """Get this thread's persistent connection to the database"""
+        return get_connection(self.db_path)
+    
     def add_location(self, report: LocationReport) -> LocationReport:
         """
         Record a new location report
@@ -36,32 +262,8 @@ class LocationService:
         Returns:
             The stored LocationReport
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT INTO location_reports (
-                id, entity_type, entity_id, node_id,
-                latitude, longitude, altitude, accuracy,
-                created_at, metadata
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?) 
-            ON CONFLICT(id) DO NOTHING
-        ''', (
-            str(report.id),
-            report.entity_type.value,
-            str(report.entity_id),
-            report.node_id,
-            report.position.latitude,
-            report.position.longitude,
-            report.position.altitude,
-            report.position.accuracy,
-            report.created_at,
-            json.dumps(report.metadata)  # Store as JSON string
-        ))
-        
-        conn.commit()
-        conn.close()
-        
+        # Committed together with any other reports written at the same time
+        _get_writer(self.db_path).write(_report_to_row(report))
         return report
     
     def add_locations_batch(self, reports: List[LocationReport], use_transaction: bool = True) -> Tuple[int, int]:
@@ -75,108 +277,109 @@ class LocationService:
         Returns:
             Tuple of (saved_count, skipped_count) where:
             - saved_count: Number of reports successfully saved
-            - skipped_count: Number of reports skipped (duplicates)
+            - skipped_count: Number of reports skipped (duplicates or rows
+              rejected by a constraint)
         """
         if not reports:
             return (0, 0)
         
-        saved_count = 0
-        skipped_count = 0
+        rows = [_report_to_row(report) for report in reports]
         
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        if use_transaction:
-            cursor.execute('BEGIN TRANSACTION')
-        
-        for report in reports:
-            cursor.execute('''
-                INSERT INTO location_reports (
-                    id, entity_type, entity_id, node_id,
-                    latitude, longitude, altitude, accuracy,
-                    created_at, metadata
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ON CONFLICT(id) DO NOTHING
-            ''', (
-                str(report.id),
-                report.entity_type.value,
-                str(report.entity_id),
-                report.node_id,
-                report.position.latitude,
-                report.position.longitude,
-                report.position.altitude,
-                report.position.accuracy,
-                report.created_at,
-                json.dumps(report.metadata)
-            ))
-            
-            if cursor.rowcount > 0:
-                saved_count += 1
-            else:
-                skipped_count += 1
-        
-        conn.commit()
-        conn.close()
+        conn = self._conn()
+        try:
+            with transaction(conn) if use_transaction else nullcontext():
+                # rowcount is the total number of rows inserted; duplicates insert nothing
+                saved_count = conn.executemany(_INSERT_LOCATION_SQL, rows).rowcount
+        except sqlite3.IntegrityError as e:
+            # One bad report fails the whole executemany; retry row by row so
+            # the valid reports are still stored and the bad ones are skipped
+            log.warning("Batch insert failed (%s), retrying row by row", e)
+            saved_count = 0
+            with transaction(conn) if use_transaction else nullcontext():
+                for idx, row in enumerate(rows):
+                    try:
+                        saved_count += conn.execute(_INSERT_LOCATION_SQL, row).rowcount
+                    except sqlite3.IntegrityError as row_error:
+                        log.warning("Skipping report %d: %s", idx, row_error)
         
-        return (saved_count, skipped_count)
+        return (saved_count, len(rows) - saved_count)
 
 
-    def get_locations_in_range(self, node_id: str, from_timestamp: int, to_timestamp: int) -> List[LocationReport]:
+    def get_locations_in_range_json(self, node_id: str, from_timestamp: int, to_timestamp: int) -> str:
         """
-        Get locations in range
-        
+        Get locations in range as a JSON array string built by SQLite
+
+        Produces the same shape as LocationReport.to_dict() for every row,
+        without materializing Python objects per row.
+
         Args:
             node_id: Node ID
             from_timestamp: From timestamp
             to_timestamp: To timestamp
+
+        Returns:
+            JSON array string (e.g. '[]' when no rows match)
         """
-        conn = None
-        try:
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                SELECT * FROM location_reports WHERE node_id = ? AND created_at >= ? AND created_at <= ?
-            ''', (node_id, from_timestamp, to_timestamp))
-            
-            rows = cursor.fetchall()
-            # Verify rows are Row objects (not tuples)
-            if rows and not isinstance(rows[0], sqlite3.Row):
-                raise ValueError(f"Expected sqlite3.Row objects, got {type(rows[0])}")
-            # Convert rows to LocationReport objects before closing connection
-            reports = [self._row_to_report(row) for row in rows]
-            conn.close()
-            
-            return reports
-        except Exception as e:
-            if conn:
-                conn.close()
-            print(f"LocationService: Error getting locations in range: {e}")
-            raise
-    
-    
-    def _row_to_report(self, row: sqlite3.Row) -> LocationReport:
-        """Convert database row to LocationReport"""
-        metadata = {}
-        if row['metadata']:
-            try:
-                metadata = json.loads(row['metadata'])
-            except json.JSONDecodeError:
-                metadata = {}
-        
-        return LocationReport(
-            id=UUID(row['id']),
-            entity_type=EntityType(row['entity_type']),
-            entity_id=UUID(row['entity_id']),
-            node_id=row['node_id'],
-            position=GeoLocation(
-                latitude=row['latitude'],
-                longitude=row['longitude'],
-                altitude=row['altitude'],
-                accuracy=row['accuracy']
-            ),
-            created_at=row['created_at'],
-            metadata=metadata
-        )
+        cursor = self._conn().cursor()
+        cursor.execute(f'''
+            SELECT json_group_array({_REPORT_JSON_OBJECT})
+            FROM location_reports
+            WHERE node_id = ? AND created_at >= ? AND created_at <= ?
+        ''', (node_id, from_timestamp, to_timestamp))
+
+        return cursor.fetchone()[0]
+
+    def iter_locations_in_range_json(self, node_id: str, from_timestamp: int, to_timestamp: int) -> Iterator[str]:
+        """
+        Get locations in range as one JSON object string per row, built by SQLite
+
+        The query runs before this returns (so errors surface to the caller);
+        rows are then fetched STREAM_BATCH_SIZE at a time as the iterator is
+        consumed, so a large range is never held in memory at once. Close
+        the iterator if it is not consumed to the end.
+
+        Args:
+            node_id: Node ID
+            from_timestamp: From timestamp
+            to_timestamp: To timestamp
+
+        Returns:
+            Iterator of JSON object strings in the LocationReport.to_dict() shape
+        """
+        cursor = self._conn().execute(f'''
+            SELECT {_REPORT_JSON_OBJECT}
+            FROM location_reports
+            WHERE node_id = ? AND created_at >= ? AND created_at <= ?
+        ''', (node_id, from_timestamp, to_timestamp))
+        return _iter_first_column(cursor)
+
+    def get_locations_page_json(self, node_id: str, from_timestamp: int, to_timestamp: int,
+                                limit: int, after_id: Optional[str] = None) -> List[Tuple[int, str, str]]:
+        """
+        Get one page of locations in range, ordered by (created_at, id)
+
+        Keyset pagination: the next page starts after the last row's
+        (created_at, id), so rows sharing a millisecond are never skipped or
+        repeated across pages, and no OFFSET rows are re-read.
+
+        Args:
+            node_id: Node ID
+            from_timestamp: From timestamp (inclusive)
+            to_timestamp: To timestamp (inclusive)
+            limit: Max rows in the page
+            after_id: id of the last row of the previous page, whose
+                created_at was passed as from_timestamp
+
+        Returns:
+            List of (created_at, id, JSON object string) tuples
+        """
+        # (created_at, id) > (from, '') is the same as created_at >= from
+        cursor = self._conn().execute(f'''
+            SELECT created_at, id, {_REPORT_JSON_OBJECT}
+            FROM location_reports
+            WHERE node_id = ? AND (created_at, id) > (?, ?) AND created_at <= ?
+            ORDER BY created_at, id
+            LIMIT ?
+        ''', (node_id, from_timestamp, after_id or '', to_timestamp, limit))
+        return cursor.fetchall()
 
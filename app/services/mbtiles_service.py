@@ -2,10 +2,71 @@
 MBTiles service for serving map tiles from MBTiles files
 """
 
+import logging
+import os
 import sqlite3
+import threading
+from collections import OrderedDict
 from pathlib import Path
 from typing import Optional, Dict, Any
 
+import sys
+sys.path.append(str(Path(__file__).parent.parent))
+
+from services.database import get_connection, read_only_uri, READ_ONLY_PRAGMAS
+
+log = logging.getLogger(__name__)
+
+# Number of recently served tiles kept in memory (raster tiles are ~5-40 KB)
+TILE_CACHE_SIZE = 256
+
+_TILE_QUERY = 'SELECT tile_data FROM tiles WHERE zoom_level = ? AND tile_column = ? AND tile_row = ?'
+
+
+def _under_version_control(path: Path) -> bool:
+    """True if path is inside a git checkout (such files are not modified in place)"""
+    return any((parent / '.git').exists() for parent in path.resolve().parents)
+
+
+def ensure_tile_index(mbtiles_path: Path):
+    """
+    Make sure tile lookups use an index on tiles(zoom_level, tile_column, tile_row)
+    
+    Standard MBTiles files ship with one, but hand-built files may not, and
+    then every tile request scans the whole tiles table. The query plan is
+    checked read-only; the index is only created when the plan shows a scan
+    and the file is writable and not under version control. Otherwise the
+    missing index is logged and the file is left untouched (as it is when
+    tiles is a view).
+    """
+    try:
+        conn = sqlite3.connect(read_only_uri(mbtiles_path), uri=True)
+        try:
+            plan = conn.execute(f'EXPLAIN QUERY PLAN {_TILE_QUERY}', (0, 0, 0)).fetchall()
+        finally:
+            conn.close()
+        if not any(row[-1].startswith('SCAN') for row in plan):
+            return
+        
+        if not os.access(mbtiles_path, os.W_OK) or _under_version_control(mbtiles_path):
+            log.warning(
+                "No tile index in %s, tile lookups will scan the table. Leaving the file untouched "
+                "(read-only or under version control); add one with: "
+                "CREATE INDEX tile_index ON tiles (zoom_level, tile_column, tile_row)",
+                mbtiles_path.name
+            )
+            return
+        
+        log.info("No tile index in %s, creating one...", mbtiles_path.name)
+        conn = sqlite3.connect(str(mbtiles_path))
+        try:
+            conn.execute('CREATE INDEX IF NOT EXISTS tile_index ON tiles (zoom_level, tile_column, tile_row)')
+            conn.commit()
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        log.warning("Could not create tile index for %s: %s", mbtiles_path.name, e)
+
 
 class MBTilesService:
     """Service for reading and serving tiles from MBTiles files"""
@@ -20,6 +81,18 @@ class MBTilesService:
         self.mbtiles_path = Path(mbtiles_path)
         if not self.mbtiles_path.exists():
             raise FileNotFoundError(f"MBTiles file not found: {mbtiles_path}")
+        # The file is read-only while served, so metadata and TileJSON are read once
+        self._metadata = None
+        self._tilejson = {}  # base_url -> TileJSON dict
+        self._tile_cache = OrderedDict()  # (z, x, y) -> tile bytes or None, LRU order
+        self._tile_cache_lock = threading.Lock()
+        # Built once; resolving the path touches the filesystem
+        self._uri = read_only_uri(self.mbtiles_path)
+        ensure_tile_index(self.mbtiles_path)
+    
+    def _conn(self) -> sqlite3.Connection:
+        """Get this thread's persistent read connection to the MBTiles file"""
+        return get_connection(self._uri, READ_ONLY_PRAGMAS, uri=True)
     
     def get_tile(self, z: int, x: int, y: int) -> Optional[bytes]:
         """
@@ -33,53 +106,59 @@ class MBTilesService:
         Returns:
             Tile image data as bytes, or None if tile doesn't exist
         """
+        key = (z, x, y)
+        with self._tile_cache_lock:
+            if key in self._tile_cache:
+                self._tile_cache.move_to_end(key)
+                return self._tile_cache[key]
+        
         # Convert XYZ Y coordinate to TMS Y coordinate
         # MBTiles uses TMS format (row 0 at bottom), web maps use XYZ (row 0 at top)
         y_tms = (2 ** z - 1) - y
         
         try:
-            conn = sqlite3.connect(str(self.mbtiles_path))
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            
-            cursor.execute(
-                'SELECT tile_data FROM tiles WHERE zoom_level = ? AND tile_column = ? AND tile_row = ?',
-                (z, x, y_tms)
-            )
+            cursor = self._conn().execute(_TILE_QUERY, (z, x, y_tms))
             
             result = cursor.fetchone()
-            conn.close()
-            
-            if result:
-                return result['tile_data']
-            return None
+            tile_data = result['tile_data'] if result else None
             
         except sqlite3.Error as e:
-            print(f"Error reading tile from MBTiles: {e}")
+            log.error("Error reading tile from MBTiles: %s", e)
             return None
+        
+        # Missing tiles are cached too; clients keep asking for them while panning
+        with self._tile_cache_lock:
+            self._tile_cache[key] = tile_data
+            if len(self._tile_cache) > TILE_CACHE_SIZE:
+                self._tile_cache.popitem(last=False)
+        return tile_data
     
     def get_metadata(self) -> Dict[str, Any]:
         """
-        Get metadata from MBTiles file
+        Get metadata from MBTiles file (read on first call, then cached)
         
         Returns:
             Dictionary of metadata key-value pairs
         """
+        if self._metadata is None:
+            metadata = self._read_metadata()
+            if metadata is None:
+                return {}
+            self._metadata = metadata
+        return dict(self._metadata)
+    
+    def _read_metadata(self) -> Optional[Dict[str, Any]]:
+        """Read the metadata table, or return None if it can't be read"""
         try:
-            conn = sqlite3.connect(str(self.mbtiles_path))
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            
-            cursor.execute('SELECT name, value FROM metadata')
+            cursor = self._conn().execute('SELECT name, value FROM metadata')
             results = cursor.fetchall()
-            conn.close()
             
             metadata = {row['name']: row['value'] for row in results}
             return metadata
             
         except sqlite3.Error as e:
-            print(f"Error reading metadata from MBTiles: {e}")
-            return {}
+            log.error("Error reading metadata from MBTiles: %s", e)
+            return None
     
     def get_tilejson(self, base_url: str = '/api/tiles') -> Dict[str, Any]:
         """
@@ -91,6 +170,15 @@ class MBTilesService:
         Returns:
             TileJSON dictionary
         """
+        tilejson = self._tilejson.get(base_url)
+        if tilejson is None:
+            tilejson = self._build_tilejson(base_url)
+            if self._metadata is not None:  # don't cache defaults from a failed read
+                self._tilejson[base_url] = tilejson
+        return dict(tilejson)
+    
+    def _build_tilejson(self, base_url: str) -> Dict[str, Any]:
+        """Build the TileJSON dictionary from the cached metadata"""
         metadata = self.get_metadata()
         
         # Parse bounds if available
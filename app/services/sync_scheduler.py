@@ -2,6 +2,7 @@
 Background scheduler for automatic mesh node synchronization
 """
 
+import logging
 import threading
 import time
 import os
@@ -14,6 +15,8 @@ try:
 except ImportError:
     REQUESTS_AVAILABLE = False
 
+log = logging.getLogger(__name__)
+
 
 class SyncScheduler:
     """Background scheduler that periodically triggers mesh node synchronization"""
@@ -34,55 +37,64 @@ class SyncScheduler:
         self._thread = None
         self._last_sync_time = None
         self._sync_count = 0
+        # One keep-alive connection to our own API, reused by every sync
+        self._session = None
+        if REQUESTS_AVAILABLE:
+            self._session = requests.Session()
+            self._session.mount('http://', requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=4))
         
     def start(self):
         """Start the background sync thread"""
         if not self.enabled:
-            print(f"SyncScheduler: Disabled, not starting background sync thread")
+            log.info('Disabled, not starting background sync thread')
             return
             
         if self._thread and self._thread.is_alive():
-            print(f"SyncScheduler: Already running")
+            log.info('Already running')
             return
             
         self._stop_event.clear()
         self._thread = threading.Thread(target=self._run_sync_loop, daemon=True)
         self._thread.start()
-        print(f"SyncScheduler: Started background sync thread (interval: {self.interval_seconds}s)")
+        log.info('Started background sync thread (interval: %ss)', self.interval_seconds)
         
     def stop(self):
         """Stop the background sync thread"""
         if self._thread and self._thread.is_alive():
-            print(f"SyncScheduler: Stopping background sync thread...")
+            log.info('Stopping background sync thread...')
             self._stop_event.set()
             self._thread.join(timeout=5)
-            print(f"SyncScheduler: Background sync thread stopped")
+            if self._session is not None:
+                self._session.close()
+            log.info('Background sync thread stopped')
         else:
-            print(f"SyncScheduler: Not running")
+            log.info('Not running')
             
     def _run_sync_loop(self):
         """Main loop that runs in background thread"""
-        print(f"SyncScheduler: Background sync thread started")
+        log.info('Background sync thread started')
         
         if not REQUESTS_AVAILABLE:
-            print(f"SyncScheduler: ERROR - 'requests' library not available!")
-            print(f"SyncScheduler: Install it with: pip install requests")
+            log.error("'requests' library not available! Install it with: pip install requests")
             return
         
-        # Wait a bit on startup before first sync
-        time.sleep(2)
+        # Wait a bit on startup before first sync (returns early if stop() is called)
+        if self._stop_event.wait(2):
+            log.info('Background sync thread exiting')
+            return
         
+        # Syncs are scheduled on a fixed grid of interval_seconds, so the time
+        # a sync takes doesn't push every later sync back
+        next_tick = time.monotonic()
         while not self._stop_event.is_set():
             try:
-                print(f"\n{'='*60}")
-                print(f"🔄 AUTO SYNC CALLED (#{self._sync_count + 1})")
-                print(f"{'='*60}")
+                log.info('Triggering auto sync #%d', self._sync_count + 1)
                 
                 # Call the POST /api/sync endpoint via HTTP
                 sync_url = f"{self.api_url}/api/sync"
                 
                 try:
-                    response = requests.post(
+                    response = self._session.post(
                         sync_url,
                         timeout=30  # 30 second timeout for sync operation
                     )
@@ -92,43 +104,38 @@ class SyncScheduler:
                     
                     if results.get('status') != 'success':
                         error_msg = results.get('message', 'Unknown error')
-                        print(f"❌ AUTO SYNC FAILED: {error_msg}")
+                        log.warning('Auto sync failed: %s', error_msg)
                     else:
                         self._last_sync_time = datetime.now()
                         self._sync_count += 1
                         
-                        # Summary of results
-                        peers_found = results.get('peers_found', 0)
-                        peers_attempted = results.get('peers_attempted', 0)
-                        reports_pulled = results.get('total_reports_pulled', 0)
-                        reports_saved = results.get('total_reports_saved', 0)
-                        reports_skipped = results.get('total_reports_skipped', 0)
-                        errors_count = len(results.get('errors', []))
-                        
-                        print(f"\n✅ AUTO SYNC FINISHED")
-                        print(f"   Peers found: {peers_found} | Attempted: {peers_attempted}")
-                        print(f"   Reports: {reports_pulled} pulled, {reports_saved} saved, {reports_skipped} skipped")
-                        if errors_count > 0:
-                            print(f"   ⚠️  Errors: {errors_count}")
+                        # One summary line per cycle; formatted only if INFO is enabled
+                        log.info(
+                            'Auto sync #%d finished: peers found %d, attempted %d; '
+                            'reports %d pulled, %d saved, %d skipped; %d errors',
+                            self._sync_count,
+                            results.get('peers_found', 0),
+                            results.get('peers_attempted', 0),
+                            results.get('total_reports_pulled', 0),
+                            results.get('total_reports_saved', 0),
+                            results.get('total_reports_skipped', 0),
+                            len(results.get('errors') or [])
+                        )
                         
                 except requests.exceptions.RequestException as e:
-                    print(f"❌ AUTO SYNC ERROR: {type(e).__name__}: {e}")
-                        
-                print(f"{'='*60}")
-                print(f"### END AUTO SYNC ###\n")
+                    log.warning('Auto sync error: %s: %s', type(e).__name__, e)
                 
             except Exception as e:
-                print(f"SyncScheduler: ERROR in sync loop: {type(e).__name__}: {e}")
-                import traceback
-                traceback.print_exc()
+                log.exception('Error in sync loop: %s: %s', type(e).__name__, e)
             
-            # Wait for next interval (check stop_event periodically)
-            waited = 0
-            while waited < self.interval_seconds and not self._stop_event.is_set():
-                time.sleep(1)
-                waited += 1
+            # Wait for the next tick; returns True as soon as stop() sets the event.
+            # A sync that overran the interval is followed by one immediate
+            # sync rather than a burst catching up on every missed tick.
+            next_tick = max(next_tick + self.interval_seconds, time.monotonic())
+            if self._stop_event.wait(timeout=next_tick - time.monotonic()):
+                break
                 
-        print(f"SyncScheduler: Background sync thread exiting")
+        log.info('Background sync thread exiting')
         
     def get_status(self) -> dict:
         """Get current status of the scheduler"""
@@ -143,12 +150,17 @@ class SyncScheduler:
 
 # Global scheduler instance
 _scheduler = None
+_scheduler_lock = threading.Lock()
 
 
 def get_sync_scheduler() -> SyncScheduler:
     """Get the global sync scheduler instance"""
     global _scheduler
-    if _scheduler is None:
+    if _scheduler is not None:
+        return _scheduler
+    with _scheduler_lock:
+        if _scheduler is not None:
+            return _scheduler
         # Get interval from environment variable or use default (10 seconds)
         interval = int(os.environ.get('SYNC_INTERVAL_SECONDS', '10'))
         # Get enabled flag from environment variable (default: True)
@@ -157,5 +169,5 @@ def get_sync_scheduler() -> SyncScheduler:
         api_url = os.environ.get('SYNC_API_URL', 'http://localhost:5000')
         
         _scheduler = SyncScheduler(interval_seconds=interval, enabled=enabled, api_url=api_url)
-    return _scheduler
+        return _scheduler
 
@@ -2,17 +2,26 @@
 Service for handling data synchronization between mesh nodes.
 """
 
+import os
+import signal
 import subprocess
+import hashlib
+import functools
 import json
+import logging
 import platform
 import uuid
 import sqlite3
 import re
-from typing import List, Dict, Any, Optional, Tuple
+from typing import Iterator, List, Dict, Any, Optional, Tuple
 from datetime import datetime, timezone
 from pathlib import Path
 from uuid import UUID
 import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # Optional import for requests (only needed when real implementation is enabled)
 try:
@@ -20,12 +29,81 @@ try:
 except ImportError:
     requests = None
 
+# Optional import for orjson (faster decoding of peer responses, falls back to requests' json)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 sys.path.append(str(Path(__file__).parent.parent))
 
 from services.cluster_service import get_cluster_service
+from services.database import get_connection, transaction
 from services.location_service import LocationService
 from models.location import LocationReport, EntityType, GeoLocation
 
+log = logging.getLogger(__name__)
+
+# Regular expression to match MAC addresses (xx:xx:xx:xx:xx:xx or xx-xx-...)
+_MAC_RE = re.compile(r'(?:[0-9a-f]{2}[:-]){5}[0-9a-f]{2}', re.IGNORECASE)
+
+# batctl only exists on Linux; the OS doesn't change at runtime, so check once
+IS_WINDOWS = platform.system() == "Windows"
+
+# Mesh link-local range; a node's IP is <base>.<mac[4]>.<mac[5]> (from setup-mesh.sh)
+IP_RANGE_BASE = "169.254"
+
+# Seconds a `batctl o` peer list is reused before batctl is run again
+# (batman-adv's originator table itself only changes every few seconds)
+PEER_CACHE_TTL = float(os.environ.get('SYNC_PEER_CACHE_SECONDS', '30'))
+
+# Seconds to wait for `batctl o` before killing it
+BATCTL_TIMEOUT = 5
+
+# Max number of peers synced at the same time (capped so a large mesh
+# doesn't start one thread per peer)
+SYNC_MAX_WORKERS = max(1, min(32, int(os.environ.get('SYNC_MAX_WORKERS', '8'))))
+
+# (connect, read) timeout in seconds for pulls from a peer
+PEER_REQUEST_TIMEOUT = (2, 5)
+
+# Number of pull URLs whose last response (ETag, body digest) is remembered
+PEER_PULL_CACHE_SIZE = 256
+
+# Insert or overwrite a node's sync times in one statement (node_id is the primary key)
+_UPSERT_SYNC_TIMES_SQL = '''
+    INSERT INTO sync_log (node_id, last_forward_sync_at, last_backward_sync_at)
+    VALUES (?, ?, ?)
+    ON CONFLICT(node_id) DO UPDATE SET
+        last_forward_sync_at = excluded.last_forward_sync_at,
+        last_backward_sync_at = excluded.last_backward_sync_at
+'''
+
+# Add a sync_log row for a newly seen peer, leaving existing rows alone
+_INSERT_NEW_PEER_SQL = '''
+    INSERT INTO sync_log (node_id, last_forward_sync_at, last_backward_sync_at)
+    VALUES (?, ?, ?)
+    ON CONFLICT(node_id) DO NOTHING
+'''
+
+_SELECT_SYNC_TIMES_SQL = 'SELECT last_forward_sync_at, last_backward_sync_at FROM sync_log WHERE node_id = ?'
+
+# Node ids are bound as one JSON array, so the SQL text (and with it the
+# connection's cached prepared statement) is the same for any number of peers
+_SELECT_SYNC_TIMES_MANY_SQL = '''
+    SELECT node_id, last_forward_sync_at, last_backward_sync_at
+    FROM sync_log
+    WHERE node_id IN (SELECT value FROM json_each(?))
+'''
+
+
+def _kill_process_group(proc: subprocess.Popen):
+    """Kill a process started with start_new_session=True and everything it spawned"""
+    try:
+        os.killpg(proc.pid, signal.SIGKILL)
+    except OSError:
+        proc.kill()
+
 
 class SyncService:
     """Service for synchronizing data between mesh nodes"""
@@ -36,8 +114,38 @@ class SyncService:
         self.db_path = db_path
         self.cluster_service = cluster_service or get_cluster_service()
         self.location_service = LocationService(db_path)
-        self.ip_range_base = "169.254"  # From setup-mesh.sh
+        self.ip_range_base = IP_RANGE_BASE
         self._my_node_id = None
+        self._executor = None  # created on first sync, reused afterwards
+        self._executor_lock = threading.Lock()
+        self._peer_cache = (None, 0.0)  # (peers, time.monotonic() when read)
+        self._last_pulls = OrderedDict()  # pull URL -> (ETag, sha256 of body) of its last response, LRU order
+        self._last_pulls_lock = threading.Lock()
+        # Keep-alive connections to peers, shared by the sync worker threads
+        self._session = None
+        if requests is not None:
+            self._session = requests.Session()
+            self._session.mount('http://', requests.adapters.HTTPAdapter(pool_connections=16, pool_maxsize=SYNC_MAX_WORKERS))
+    
+    def _conn(self) -> sqlite3.Connection:
+        """Get this thread's persistent connection to the messaging database"""
+        return get_connection(self.db_path)
+    
+    def close(self):
+        """
+        Release the service's resources on shutdown: waits for running peer
+        syncs, closes pooled HTTP connections and checkpoints the WAL back
+        into the database file (truncating it to zero bytes).
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        if self._session is not None:
+            self._session.close()
+        try:
+            self._conn().execute('PRAGMA wal_checkpoint(TRUNCATE)')
+        except sqlite3.Error as e:
+            log.warning("Error checkpointing database on close: %s", e)
     
     def get_my_node_id(self) -> str:
         """Get and cache this node's ID."""
@@ -49,93 +157,114 @@ class SyncService:
         """
         Gets all visible peers from the B.A.T.M.A.N. mesh
         and returns a dict of {mac: ip}.
+        
+        The result of a successful `batctl o` run is reused for
+        PEER_CACHE_TTL seconds; call invalidate_peers() to force a re-read.
         """
+        cached_peers, cached_at = self._peer_cache
+        if cached_peers is not None and time.monotonic() - cached_at < PEER_CACHE_TTL:
+            return dict(cached_peers)
+        
         peers = {}
         my_node_id = self.get_my_node_id()
         
         # Mock data for local testing on Windows
-        if platform.system() == "Windows":
-            print("SyncService: WARNING: Cannot run 'batctl' on Windows. Returning empty peers.")
+        if IS_WINDOWS:
+            log.warning("Cannot run 'batctl' on Windows. Returning empty peers.")
             return {
             }
         
         try:
             # Run `batctl o` to get the list of mesh originators (nodes)
             # Note: `-f json` is not supported in all versions, so we parse text output
-            result = subprocess.run(
-                ['sudo', 'batctl', 'o'],
-                capture_output=True, text=True, timeout=5, check=True
-            )
-            
-            if not result.stdout.strip():
-                return {}
-            
-            # Parse text output - each line contains originator info
-            lines = result.stdout.strip().split('\n')
-            
-            # Regular expression to match MAC addresses (xx:xx:xx:xx:xx:xx)
-            mac_pattern = re.compile(r'([0-9a-fA-F]{2}[:-]){5}([0-9a-fA-F]{2})')
-            
-            for line in lines:
-                if not line.strip():
-                    continue
-                
-                # Skip header lines
-                if 'Originator' in line and 'last-seen' in line:
-                    continue
-                if line.startswith('[B.A.T.M.A.N.'):
-                    continue
-                
-                # Find MAC address in the line
-                mac_match = mac_pattern.search(line)
-                if mac_match:
-                    peer_mac = mac_match.group(0).replace('-', ':')  # Normalize to colons
-                    peer_mac = peer_mac.lower()  # Normalize to lowercase
-                    
-                    # Skip if it's our own node ID
-                    if peer_mac == my_node_id:
-                        continue
-                    
-                    # Calculate IP from MAC
-                    peer_ip = self._calculate_ip_from_mac(peer_mac)
-                    if peer_ip:
-                        peers[peer_mac] = peer_ip
+            # Output is read line by line as batctl writes it instead of
+            # being buffered whole. batctl runs in its own session so the
+            # timer can kill sudo and batctl together if it hangs (killing
+            # only sudo would leave batctl holding the pipe open)
+            cmd = ['sudo', 'batctl', 'o']
+            proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True,
+                                    start_new_session=True)
+            timer = threading.Timer(BATCTL_TIMEOUT, _kill_process_group, (proc,))
+            timer.start()
+            try:
+                for line in proc.stdout:
+                    self._parse_originator_line(line, my_node_id, peers)
+                returncode = proc.wait()
+                timed_out = timer.finished.is_set()
+            finally:
+                timer.cancel()
+                proc.stdout.close()
+            
+            if timed_out:
+                raise subprocess.TimeoutExpired(cmd, BATCTL_TIMEOUT)
+            if returncode != 0:
+                raise subprocess.CalledProcessError(returncode, cmd)
                     
         except FileNotFoundError as e:
-            print(f"SyncService: Error: 'sudo' or 'batctl' command not found: {e}")
+            log.error("'sudo' or 'batctl' command not found: %s", e)
             return {}
         except subprocess.CalledProcessError as e:
-            print(f"SyncService: Error running batctl (code {e.returncode})")
+            log.error("Error running batctl (code %s)", e.returncode)
             return {}
         except Exception as e:
-            print(f"SyncService: Error processing batctl output: {e}")
+            log.error("Error processing batctl output: %s", e)
             return {}
         
         if peers:
-            print(f"SyncService: Found {len(peers)} peers")
+            log.debug("Found %d peers", len(peers))
+        self._peer_cache = (dict(peers), time.monotonic())
         return peers
     
-    def _calculate_ip_from_mac(self, mac: str) -> Optional[str]:
+    def invalidate_peers(self):
+        """Drop the cached peer list so the next get_all_peers() runs batctl again"""
+        self._peer_cache = (None, 0.0)
+    
+    def _parse_originator_line(self, line: str, my_node_id: str, peers: Dict[str, str]):
+        """Add the peer on one line of `batctl o` output (if any) to peers as {mac: ip}"""
+        if not line.strip():
+            return
+        
+        # Skip header lines
+        if 'Originator' in line and 'last-seen' in line:
+            return
+        if line.startswith('[B.A.T.M.A.N.'):
+            return
+        
+        # Find MAC address in the line
+        mac_match = _MAC_RE.search(line)
+        if mac_match:
+            peer_mac = mac_match.group(0).replace('-', ':')  # Normalize to colons
+            peer_mac = peer_mac.lower()  # Normalize to lowercase
+            
+            # Skip if it's our own node ID
+            if peer_mac == my_node_id:
+                return
+            
+            # Calculate IP from MAC
+            peer_ip = self._calculate_ip_from_mac(peer_mac)
+            if peer_ip:
+                peers[peer_mac] = peer_ip
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=1024)
+    def _calculate_ip_from_mac(mac: str) -> Optional[str]:
         """
         Calculates a node's IP from its MAC address,
         using the exact logic from setup-mesh.sh.
+        Pure function of the MAC, so results are memoized.
         """
         try:
-            parts = mac.split(':')
-            
-            if len(parts) != 6:
+            # Parse all six bytes at once (raises ValueError on bad hex)
+            raw = bytes.fromhex(mac.replace(':', ''))
+            if len(raw) != 6:
                 return None
             
             # This is the logic from setup-mesh.sh:
-            # Extract last 2 bytes (parts[4] and parts[5])
-            # Convert hex to decimal for octet 3 and 4
-            o3 = int(parts[4], 16)
-            o4 = int(parts[5], 16)
-            
-            ip = f"{self.ip_range_base}.{o3}.{o4}"
+            # Last 2 bytes of the MAC are octets 3 and 4 of the IP
+            ip = f"{IP_RANGE_BASE}.{raw[4]}.{raw[5]}"
             return ip
         except Exception as e:
-            print(f"SyncService: Error calculating IP for {mac}: {e}")
+            log.warning("Error calculating IP for %s: %s", mac, e)
             return None
     
     def get_last_sync_times(self, node_id: str) -> Tuple[int, int]:
@@ -144,13 +273,8 @@ class SyncService:
         Returns (0, 0) if no sync_log entry exists for this node.
         """
         try:
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            
-            cursor.execute('SELECT last_forward_sync_at, last_backward_sync_at FROM sync_log WHERE node_id = ?', (node_id,))
+            cursor = self._conn().execute(_SELECT_SYNC_TIMES_SQL, (node_id,))
             row = cursor.fetchone()
-            conn.close()
             
             if row:
                 forward = row['last_forward_sync_at'] if row['last_forward_sync_at'] else 0
@@ -159,40 +283,58 @@ class SyncService:
             else:
                 return (0, 0)
         except Exception as e:
-            print(f"SyncService: Error getting sync times for {node_id}: {e}")
-            if 'conn' in locals():
-                conn.close()
+            log.error("Error getting sync times for %s: %s", node_id, e)
             return (0, 0)
     
+    def get_sync_times_for_nodes(self, node_ids: List[str]) -> Dict[str, Tuple[int, int]]:
+        """
+        Gets the (forward, backward) sync timestamps for several nodes in one query.
+        Nodes without a sync_log entry are left out; callers default them to (0, 0).
+        """
+        if not node_ids:
+            return {}
+        
+        try:
+            cursor = self._conn().execute(_SELECT_SYNC_TIMES_MANY_SQL, (json.dumps(node_ids),))
+            
+            return {
+                node_id: (forward or 0, backward or 0)
+                for node_id, forward, backward in cursor
+            }
+        except Exception as e:
+            log.error("Error getting sync times for %d nodes: %s", len(node_ids), e)
+            return {}
+    
     def update_sync_times(self, node_id: str, forward_sync_at: int, backward_sync_at: int):
         """
         Updates the forward and backward sync timestamps for a node in the sync_log table.
         Creates a new entry if one doesn't exist, or updates existing entry.
         """
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+            self._conn().execute(_UPSERT_SYNC_TIMES_SQL, (node_id, forward_sync_at, backward_sync_at))
             
-            cursor.execute('SELECT node_id FROM sync_log WHERE node_id = ?', (node_id,))
-            existing = cursor.fetchone()
-            
-            if existing:
-                cursor.execute('''
-                    UPDATE sync_log 
-                    SET last_forward_sync_at = ?, last_backward_sync_at = ?
-                    WHERE node_id = ?
-                ''', (forward_sync_at, backward_sync_at, node_id))
-            else:
-                cursor.execute('''
-                    INSERT INTO sync_log (node_id, last_forward_sync_at, last_backward_sync_at)
-                    VALUES (?, ?, ?)
-                ''', (node_id, forward_sync_at, backward_sync_at))
-            
-            conn.commit()
-            conn.close()
+        except Exception as e:
+            log.error("Error updating sync times for %s: %s", node_id, e)
+    
+    def update_sync_times_bulk(self, entries: List[Tuple[str, int, int]]) -> bool:
+        """
+        Writes (node_id, forward_sync_at, backward_sync_at) for several nodes
+        in a single transaction.
+        
+        Returns:
+            True if the sync times were committed
+        """
+        if not entries:
+            return True
+        
+        try:
+            with transaction(self._conn()) as conn:
+                conn.executemany(_UPSERT_SYNC_TIMES_SQL, entries)
+            return True
             
         except Exception as e:
-            print(f"SyncService: Error updating sync times for {node_id}: {e}")
+            log.error("Error updating sync times for %d nodes: %s", len(entries), e)
+            return False
     
     def log_incoming_sync_request(self, peer_ip: str, peer_node_id: Optional[str] = None):
         """
@@ -238,7 +380,8 @@ class SyncService:
                             return f"Connection failed: {reason}"
             return f"Connection error: {error_msg[:150]}"  # Limit length
     
-    def pull_data_from_peer(self, peer_ip: str, from_timestamp: int, until_timestamp: int) -> List[LocationReport]:
+    def pull_data_from_peer(self, peer_ip: str, from_timestamp: int, until_timestamp: int,
+                            pulls: Optional[List[Tuple[str, Optional[str], bytes]]] = None) -> List[LocationReport]:
         """
         Pulls data from a peer's sync endpoint within a time range.
         
@@ -246,25 +389,46 @@ class SyncService:
             peer_ip: IP address of the peer
             from_timestamp: Start timestamp (ms)
             until_timestamp: End timestamp (ms)
+            pulls: If given, (url, ETag, body digest) of the response is
+                appended to it. Pass them to _remember_pulls only once the
+                reports are saved and the sync times committed, or a window
+                whose cursor didn't move would be skipped as unchanged forever.
         
         Returns:
             List of LocationReport objects (empty on error)
         """
         if requests is None:
-            print(f"SyncService: Error: 'requests' library not installed. Cannot pull data from {peer_ip}")
+            log.error("'requests' library not installed. Cannot pull data from %s", peer_ip)
             return []
         
         try:
-            url = f"http://{peer_ip}:5000/api/sync/node/sync/from/{from_timestamp}/to/{until_timestamp}"
+            url = f"{self._peer_base_url(peer_ip)}api/sync/node/sync/from/{from_timestamp}/to/{until_timestamp}"
             
-            response = requests.get(url, timeout=5)
+            # Revalidate a window we already pulled; the peer answers 304 with
+            # no body if nothing in it changed, and then there is nothing new
+            headers = {}
+            etag, last_digest = self._get_last_pull(url)
+            if etag:
+                headers['If-None-Match'] = etag
+            
+            response = self._session.get(url, headers=headers, timeout=PEER_REQUEST_TIMEOUT)
             response.raise_for_status()
             
-            response_data = response.json()
+            if response.status_code == 304:
+                return []
+            
+            # Peers without ETag support send the full body again; a body
+            # identical to the last one for this window has nothing new either
+            digest = hashlib.sha256(response.content).digest()
+            if digest == last_digest:
+                return []
+            
+            # orjson decodes the raw body several times faster than response.json()
+            response_data = orjson.loads(response.content) if orjson is not None else response.json()
             
             if response_data.get('status') != 'success':
                 error_msg = f"Peer returned error: {response_data.get('message', 'Unknown error')}"
-                print(f"SyncService: {error_msg}")
+                log.warning(error_msg)
                 return []
             
             data_list = response_data.get('data', [])
@@ -272,14 +436,39 @@ class SyncService:
             # Convert dicts to LocationReport objects
             reports = [LocationReport.from_dict(item) for item in data_list]
             
+            if pulls is not None:
+                pulls.append((url, response.headers.get('ETag'), digest))
+            
             return reports
         except Exception as e:
-            print(f"SyncService: Error pulling data from {peer_ip}: {str(e)}")
+            log.warning("Error pulling data from %s: %s", peer_ip, e)
             raise e
     
+    def _get_last_pull(self, url: str) -> Tuple[Optional[str], Optional[bytes]]:
+        """Get (ETag, body digest) of the last successful pull of url, (None, None) if not cached"""
+        with self._last_pulls_lock:
+            last_pull = self._last_pulls.get(url)
+            if last_pull is None:
+                return (None, None)
+            self._last_pulls.move_to_end(url)
+            return last_pull
+    
+    def _remember_pulls(self, pulls: List[Tuple[str, Optional[str], bytes]]):
+        """Remember the (url, ETag, body digest) of pulls whose data and sync times are committed"""
+        with self._last_pulls_lock:
+            for url, etag, digest in pulls:
+                self._last_pulls[url] = (etag, digest)
+                self._last_pulls.move_to_end(url)
+            while len(self._last_pulls) > PEER_PULL_CACHE_SIZE:
+                self._last_pulls.popitem(last=False)
+    
+    def _peer_base_url(self, peer_ip: str) -> str:
+        """Base URL of a peer's API"""
+        return f"http://{peer_ip}:5000/"
+    
     def save_location_reports(self, reports: List[Dict[str, Any]]) -> Tuple[int, int]:
         """
-        Save location reports from peer data to the database using INSERT OR IGNORE.
+        Save location reports from peer data to the database, ignoring duplicates.
         
         Args:
             reports: List of location report dicts (from peer API response)
@@ -292,68 +481,48 @@ class SyncService:
         if not reports:
             return (0, 0)
         
-        saved_count = 0
-        skipped_count = 0
+        parsed = []
+        invalid_count = 0
+        for report_dict in reports:
+            try:
+                # Convert dict to LocationReport object
+                parsed.append(LocationReport.from_dict(report_dict))
+            except Exception as e:
+                log.warning("Error saving report: %s", e)
+                invalid_count += 1
         
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            for report_dict in reports:
-                try:
-                    # Convert dict to LocationReport object
-                    report = LocationReport.from_dict(report_dict)
-                    
-                    # Use INSERT OR IGNORE to handle duplicates
-                    cursor.execute('''
-                        INSERT OR IGNORE INTO location_reports (
-                            id, entity_type, entity_id, node_id,
-                            latitude, longitude, altitude, accuracy,
-                            created_at, metadata
-                        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    ''', (
-                        str(report.id),
-                        report.entity_type.value,
-                        str(report.entity_id),
-                        report.node_id,
-                        report.position.latitude,
-                        report.position.longitude,
-                        report.position.altitude,
-                        report.position.accuracy,
-                        report.created_at,
-                        json.dumps(report.metadata)
-                    ))
-                    
-                    if cursor.rowcount > 0:
-                        saved_count += 1
-                    else:
-                        skipped_count += 1
-                        
-                except Exception as e:
-                    print(f"SyncService: Error saving report: {e}")
-                    skipped_count += 1
-            
-            conn.commit()
-            conn.close()
-            
+            # Same cached INSERT statement and single transaction as local batch writes
+            saved_count, skipped_count = self.location_service.add_locations_batch(parsed)
         except Exception as e:
-            print(f"SyncService: Error in save_location_reports: {e}")
-            skipped_count += len(reports) - saved_count
+            log.error("Error in save_location_reports: %s", e)
+            saved_count, skipped_count = 0, len(parsed)
         
-        return (saved_count, skipped_count)
+        return (saved_count, skipped_count + invalid_count)
     
-    def get_own_data_since(self, since_timestamp: int, until_timestamp: Optional[int] = None) -> List[Dict[str, Any]]:
+    def iter_own_data_since(self, since_timestamp: int, until_timestamp: Optional[int] = None) -> Iterator[str]:
         """
-        Gets this node's location data since a timestamp.
-        If until_timestamp is None, defaults to current time.
+        Gets this node's location data since a timestamp as one JSON object
+        string per report, yielded while the rows are read (for streaming
+        responses). If until_timestamp is None, defaults to current time.
         """
         if until_timestamp is None:
-            until_timestamp = int(datetime.now(timezone.utc).timestamp() * 1000)
+            until_timestamp = time.time_ns() // 1_000_000
         
         node_id = self.get_my_node_id()
-        reports = self.location_service.get_locations_in_range(node_id, since_timestamp, until_timestamp)
-        return [report.to_dict() for report in reports]
-
+        return self.location_service.iter_locations_in_range_json(node_id, since_timestamp, until_timestamp)
+    
+    def get_own_data_page(self, since_timestamp: int, limit: int, after_id: Optional[str] = None,
+                          until_timestamp: Optional[int] = None) -> List[Tuple[int, str, str]]:
+        """
+        Gets one keyset page of this node's reports as (created_at, id, JSON string)
+        tuples; see LocationService.get_locations_page_json.
+        """
+        if until_timestamp is None:
+            until_timestamp = time.time_ns() // 1_000_000
+        
+        node_id = self.get_my_node_id()
+        return self.location_service.get_locations_page_json(node_id, since_timestamp, until_timestamp, limit, after_id)
     
     def sync_with_all_peers(self) -> Dict[str, Any]:
         """
@@ -373,7 +542,7 @@ class SyncService:
         """
         peers = self.get_all_peers()
         
-        now_ms = int(datetime.now(timezone.utc).timestamp() * 1000)
+        now_ms = time.time_ns() // 1_000_000
         sync_window_ms = 5 * 60 * 1000  # 5 minutes in milliseconds
         
         # Statistics tracking
@@ -385,87 +554,54 @@ class SyncService:
         total_reports_skipped = 0
         errors = []
         
-        print(f"SyncService: Starting sync with {peers_found} peers")
+        log.debug("Starting sync with %d peers", peers_found)
         
         # Get all nodes that have location reports but aren't in current peers list
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
             # Initialize entries for current peers if they don't exist
-            for peer_mac, peer_ip in peers.items():
-                cursor.execute('SELECT node_id FROM sync_log WHERE node_id = ?', (peer_mac,))
-                if not cursor.fetchone():
-                    cursor.execute('''
-                        INSERT INTO sync_log (node_id, last_forward_sync_at, last_backward_sync_at)
-                        VALUES (?, ?, ?)
-                    ''', (peer_mac, now_ms, now_ms))
-            
-            conn.commit()
-            conn.close()
+            with transaction(self._conn()) as conn:
+                conn.executemany(_INSERT_NEW_PEER_SQL, [(peer_mac, now_ms, now_ms) for peer_mac in peers])
             
         except Exception as e:
             error_msg = f"Error initializing sync_log entries: {e}"
-            print(f"SyncService: {error_msg}")
+            log.warning(error_msg)
             errors.append(error_msg)
         
-        for peer_mac, peer_ip in peers.items():
-            peers_attempted += 1
+        sync_times = self.get_sync_times_for_nodes(list(peers))
+        
+        # Pull from peers concurrently; each peer is network-bound (up to the
+        # request timeout), so a slow peer no longer delays all the others
+        futures = {
+            self._get_executor().submit(
+                self._sync_with_peer, peer_mac, peer_ip, sync_times.get(peer_mac, (0, 0)), now_ms, sync_window_ms
+            ): (peer_mac, peer_ip)
+            for peer_mac, peer_ip in peers.items()
+        }
+        peers_attempted = len(futures)
+        synced_times = []
+        synced_pulls = []
+        
+        for future in as_completed(futures):
+            peer_mac, peer_ip = futures[future]
             try:
-                # Get sync times for this peer
-                forward_sync_at, backward_sync_at = self.get_last_sync_times(peer_mac)
-                
-                # Forward sync: Get new data from last_forward_sync_at to now (in 5min chunks)
-                # We sync 5 minutes at a time to avoid pulling too much data at once
-                forward_from: int = forward_sync_at
-                forward_until: int = min(forward_from + sync_window_ms, now_ms)
-                forward_data: List[LocationReport] = self.pull_data_from_peer(peer_ip, forward_from, forward_until)
-                
-                # Save forward sync data and find latest created_at
-                forward_latest = forward_sync_at
-                forward_pulled = len(forward_data)
-                total_reports_pulled += forward_pulled
-                
-                if forward_data:
-                    saved, skipped = self.location_service.add_locations_batch(forward_data)
-                    total_reports_saved += saved
-                    total_reports_skipped += skipped
-                    
-                    # Find latest created_at in forward data
-                    for report in forward_data:
-                        created_at = report.created_at
-                        if created_at > forward_latest:
-                            forward_latest = created_at
-                
-                # Backward sync: Get old data from (backward_sync_at - 5min) to backward_sync_at
-                # This fills gaps in historical data
-                backward_from = max(0, backward_sync_at - sync_window_ms)
-                backward_data: List[LocationReport] = self.pull_data_from_peer(peer_ip, backward_from, backward_sync_at)
-                
-                # Save backward sync data and find oldest created_at
-                backward_oldest = backward_sync_at
-                backward_pulled = len(backward_data)
-                total_reports_pulled += backward_pulled
-                
-                if backward_data:
-                    saved, skipped = self.location_service.add_locations_batch(backward_data)
-                    total_reports_saved += saved
-                    total_reports_skipped += skipped
-                    
-                    # Find oldest created_at in backward data
-                    for report in backward_data:
-                        created_at = report.created_at
-                        if created_at < backward_oldest or backward_oldest == backward_sync_at:
-                            backward_oldest = created_at
-                
-                self.update_sync_times(peer_mac, forward_latest, backward_oldest)
+                pulled, saved, skipped, forward_latest, backward_oldest, pulls = future.result()
+                total_reports_pulled += pulled
+                total_reports_saved += saved
+                total_reports_skipped += skipped
+                synced_times.append((peer_mac, forward_latest, backward_oldest))
+                synced_pulls.extend(pulls)
                 peers_synced += 1
                 
             except Exception as e:
                 error_msg = f"Error syncing with {peer_mac} ({peer_ip}): {str(e)}"
-                print(f"SyncService: {error_msg}")
+                log.warning(error_msg)
                 errors.append(error_msg)
         
+        # Record the new sync times of every peer that succeeded in one
+        # transaction; only then may the pulled windows be skipped next time
+        if self.update_sync_times_bulk(synced_times):
+            self._remember_pulls(synced_pulls)
+        
         return {
             'peers_found': peers_found,
             'peers_attempted': peers_attempted,
@@ -476,26 +612,96 @@ class SyncService:
             'errors': errors
         }
     
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Get the thread pool used for per-peer syncs, creating it on first use"""
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=SYNC_MAX_WORKERS, thread_name_prefix='peer-sync')
+        return self._executor
+    
+    def _sync_with_peer(self, peer_mac: str, peer_ip: str, sync_times: Tuple[int, int],
+                        now_ms: int, sync_window_ms: int) -> Tuple[int, int, int, int, int, list]:
+        """
+        Runs one forward and one backward sync window against a peer.
+        
+        sync_times is the peer's current (forward, backward) sync timestamps.
+        The new ones are returned rather than written, so the caller can
+        store them for all peers at once.
+        
+        Returns:
+            Tuple of (reports_pulled, reports_saved, reports_skipped,
+            forward_sync_at, backward_sync_at, pulls), where pulls are the
+            (url, ETag, body digest) of both windows for _remember_pulls
+        
+        Raises:
+            Exception: if pulling from the peer fails
+        """
+        pulled = 0
+        saved_total = 0
+        skipped_total = 0
+        pulls = []
+        
+        forward_sync_at, backward_sync_at = sync_times
+        
+        # Forward sync: Get new data from last_forward_sync_at to now (in 5min chunks)
+        # We sync 5 minutes at a time to avoid pulling too much data at once
+        forward_from: int = forward_sync_at
+        forward_until: int = min(forward_from + sync_window_ms, now_ms)
+        forward_data: List[LocationReport] = self.pull_data_from_peer(peer_ip, forward_from, forward_until, pulls)
+        
+        # Save forward sync data and find latest created_at
+        forward_latest = forward_sync_at
+        pulled += len(forward_data)
+        
+        if forward_data:
+            saved, skipped = self.location_service.add_locations_batch(forward_data)
+            saved_total += saved
+            skipped_total += skipped
+            
+            # Find latest created_at in forward data
+            for report in forward_data:
+                created_at = report.created_at
+                if created_at > forward_latest:
+                    forward_latest = created_at
+        
+        # Backward sync: Get old data from (backward_sync_at - 5min) to backward_sync_at
+        # This fills gaps in historical data
+        backward_from = max(0, backward_sync_at - sync_window_ms)
+        backward_data: List[LocationReport] = self.pull_data_from_peer(peer_ip, backward_from, backward_sync_at, pulls)
+        
+        # Save backward sync data and find oldest created_at
+        backward_oldest = backward_sync_at
+        pulled += len(backward_data)
+        
+        if backward_data:
+            saved, skipped = self.location_service.add_locations_batch(backward_data)
+            saved_total += saved
+            skipped_total += skipped
+            
+            # Find oldest created_at in backward data
+            for report in backward_data:
+                created_at = report.created_at
+                if created_at < backward_oldest or backward_oldest == backward_sync_at:
+                    backward_oldest = created_at
+        
+        return (pulled, saved_total, skipped_total, forward_latest, backward_oldest, pulls)
+    
     def get_sync_log_status(self) -> List[Dict[str, Any]]:
         """
         Get sync_log status for all nodes.
         Returns a list of sync_log entries with readable timestamps.
         """
         try:
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            
-            cursor.execute('''
+            cursor = self._conn().execute('''
                 SELECT node_id, last_forward_sync_at, last_backward_sync_at
                 FROM sync_log
                 ORDER BY last_forward_sync_at DESC
             ''')
             
             rows = cursor.fetchall()
-            conn.close()
             
-            now_ms = int(datetime.now(timezone.utc).timestamp() * 1000)
+            now_ms = time.time_ns() // 1_000_000
             
             status_list = []
             for row in rows:
@@ -515,17 +721,20 @@ class SyncService:
             return status_list
             
         except Exception as e:
-            print(f"SyncService: Error getting sync log status: {e}")
+            log.error("Error getting sync log status: %s", e)
             return []
 
 
 # --- Singleton setup (matches cluster_service.py) ---
 _sync_service = None
+_sync_service_lock = threading.Lock()
 
 def get_sync_service() -> SyncService:
     """Get the singleton SyncService instance"""
     global _sync_service
     if _sync_service is None:
-        _sync_service = SyncService()
+        with _sync_service_lock:
+            if _sync_service is None:
+                _sync_service = SyncService()
     return _sync_service
 
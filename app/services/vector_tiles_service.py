@@ -6,9 +6,18 @@ Handles gzip decompression for vector tiles
 import sqlite3
 import gzip
 import json
+import logging
 from pathlib import Path
 from typing import Optional, Dict, Any
 
+import sys
+sys.path.append(str(Path(__file__).parent.parent))
+
+from services.database import get_connection, read_only_uri, READ_ONLY_PRAGMAS
+from services.mbtiles_service import ensure_tile_index
+
+log = logging.getLogger(__name__)
+
 
 class VectorTilesService:
     """Service for reading and serving vector tiles (PBF/MVT) from MBTiles files"""
@@ -23,6 +32,16 @@ class VectorTilesService:
         self.mbtiles_path = Path(mbtiles_path)
         if not self.mbtiles_path.exists():
             raise FileNotFoundError(f"MBTiles file not found: {mbtiles_path}")
+        # The file is read-only while served, so metadata and TileJSON are read once
+        self._metadata = None
+        self._tilejson = {}  # base_url -> TileJSON dict
+        # Built once; resolving the path touches the filesystem
+        self._uri = read_only_uri(self.mbtiles_path)
+        ensure_tile_index(self.mbtiles_path)
+    
+    def _conn(self) -> sqlite3.Connection:
+        """Get this thread's persistent read connection to the MBTiles file"""
+        return get_connection(self._uri, READ_ONLY_PRAGMAS, uri=True)
     
     def get_tile(self, z: int, x: int, y: int, decompress: bool = True) -> Optional[bytes]:
         """
@@ -42,17 +61,12 @@ class VectorTilesService:
         y_tms = (2 ** z - 1) - y
         
         try:
-            conn = sqlite3.connect(str(self.mbtiles_path))
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            
-            cursor.execute(
+            cursor = self._conn().execute(
                 'SELECT tile_data FROM tiles WHERE zoom_level = ? AND tile_column = ? AND tile_row = ?',
                 (z, x, y_tms)
             )
             
             result = cursor.fetchone()
-            conn.close()
             
             if result:
                 tile_data = result['tile_data']
@@ -65,37 +79,41 @@ class VectorTilesService:
                             original_size = len(tile_data)
                             tile_data = gzip.decompress(tile_data)
                             decompressed_size = len(tile_data)
-                            print(f"[VectorTiles] Decompressed tile {z}/{x}/{y}.pbf: {original_size} -> {decompressed_size} bytes")
+                            log.debug("Decompressed tile %d/%d/%d.pbf: %d -> %d bytes", z, x, y, original_size, decompressed_size)
                         except gzip.BadGzipFile:
-                            print(f"[VectorTiles] Warning: Tile {z}/{x}/{y}.pbf has gzip magic bytes but failed to decompress, using as-is")
+                            log.warning("Tile %d/%d/%d.pbf has gzip magic bytes but failed to decompress, using as-is", z, x, y)
                         except Exception as e:
-                            print(f"[VectorTiles] Error decompressing tile {z}/{x}/{y}.pbf: {e}")
+                            log.error("Error decompressing tile %d/%d/%d.pbf: %s", z, x, y, e)
                             return None
                     else:
-                        print(f"[VectorTiles] Tile {z}/{x}/{y}.pbf is not gzip-compressed (magic bytes: {tile_data[0:2].hex()})")
+                        log.debug("Tile %d/%d/%d.pbf is not gzip-compressed (magic bytes: %s)", z, x, y, tile_data[0:2].hex())
                 
                 return tile_data
             return None
             
         except sqlite3.Error as e:
-            print(f"Error reading tile from MBTiles: {e}")
+            log.error("Error reading tile from MBTiles: %s", e)
             return None
     
     def get_metadata(self) -> Dict[str, Any]:
         """
-        Get metadata from MBTiles file
+        Get metadata from MBTiles file (read on first call, then cached)
         
         Returns:
             Dictionary of metadata key-value pairs
         """
+        if self._metadata is None:
+            metadata = self._read_metadata()
+            if metadata is None:
+                return {}
+            self._metadata = metadata
+        return dict(self._metadata)
+    
+    def _read_metadata(self) -> Optional[Dict[str, Any]]:
+        """Read the metadata table, or return None if it can't be read"""
         try:
-            conn = sqlite3.connect(str(self.mbtiles_path))
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            
-            cursor.execute('SELECT name, value FROM metadata')
+            cursor = self._conn().execute('SELECT name, value FROM metadata')
             results = cursor.fetchall()
-            conn.close()
             
             metadata = {row['name']: row['value'] for row in results}
             
@@ -105,13 +123,13 @@ class VectorTilesService:
                     json_metadata = json.loads(metadata['json'])
                     metadata['vector_layers'] = json_metadata.get('vector_layers', [])
                 except json.JSONDecodeError:
-                    print(f"[VectorTiles] Warning: Could not parse JSON metadata")
+                    log.warning("Could not parse JSON metadata")
             
             return metadata
             
         except sqlite3.Error as e:
-            print(f"Error reading metadata from MBTiles: {e}")
-            return {}
+            log.error("Error reading metadata from MBTiles: %s", e)
+            return None
     
     def get_tilejson(self, base_url: str = '/api/tiles/vector') -> Dict[str, Any]:
         """
@@ -123,6 +141,15 @@ class VectorTilesService:
         Returns:
             TileJSON dictionary with vector_layers information
         """
+        tilejson = self._tilejson.get(base_url)
+        if tilejson is None:
+            tilejson = self._build_tilejson(base_url)
+            if self._metadata is not None:  # don't cache defaults from a failed read
+                self._tilejson[base_url] = tilejson
+        return dict(tilejson)
+    
+    def _build_tilejson(self, base_url: str) -> Dict[str, Any]:
+        """Build the TileJSON dictionary from the cached metadata"""
         metadata = self.get_metadata()
         
         # Parse bounds if available
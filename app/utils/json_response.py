@@ -0,0 +1,33 @@
+"""
+JSON response helper that serializes with orjson when it is installed
+"""
+
+from flask import Response, jsonify
+
+# Optional import for orjson (falls back to Flask's jsonify)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def json_response(payload, status: int = 200) -> Response:
+    """
+    Build a JSON response from a dict/list payload
+
+    Args:
+        payload: JSON-serializable data
+        status: HTTP status code (default: 200)
+
+    Returns:
+        Flask Response with mimetype application/json
+    """
+    if orjson is None:
+        response = jsonify(payload)
+        response.status_code = status
+        return response
+    return Response(
+        orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS),
+        status=status,
+        mimetype='application/json'
+    )
@@ -3,7 +3,7 @@
 # This script sets up:
 #   1. DNS resolution for "nexum" hostname to resolve to the access point IP
 #   2. Port forwarding from port 80 to 5000 (for HTTP Flask app)
-#   3. Port forwarding from port 443 to 5000 (for HTTPS Flask app)
+#   3. Port 443 (HTTPS) left to nginx (app/nginx.conf); it is not forwarded to 5000
 #
 # Prerequisites: setup-ap.sh must be run first
 
@@ -100,7 +100,7 @@ echo "  Bridge interface: $BRIDGE_INTERFACE"
 echo "  Bridge IP: $BRIDGE_IP"
 echo "  Hostname: nexum"
 echo "  Port forwarding: 80 → 5000 (HTTP)"
-echo "  Port forwarding: 443 → 5000 (HTTPS)"
+echo "  Port 443 (HTTPS): nginx only, never forwarded to 5000"
 echo ""
 
 # ==============================================================================
@@ -148,7 +148,7 @@ echo "  ✓ DNS configured: nexum → $BRIDGE_IP"
 # ==============================================================================
 
 echo ""
-echo "Configuring port forwarding (80 → 5000 and 443 → 5000)..."
+echo "Configuring port forwarding (80 → 5000)..."
 
 # Check if iptables is available
 if ! command -v iptables &> /dev/null; then
@@ -176,7 +176,7 @@ iptables -t nat -D PREROUTING -p tcp --dport 80 -j REDIRECT --to-port 5000 2>/de
 iptables -t nat -D OUTPUT -p tcp -d 127.0.0.1 --dport 80 -j REDIRECT --to-port 5000 2>/dev/null || true
 iptables -t nat -D OUTPUT -p tcp -d "$BRIDGE_IP" --dport 80 -j REDIRECT --to-port 5000 2>/dev/null || true
 
-# Remove HTTPS (443) rules
+# Remove HTTPS (443) rules left by older versions of this script
 iptables -t nat -D PREROUTING -p tcp --dport 443 -j REDIRECT --to-port 5000 2>/dev/null || true
 iptables -t nat -D OUTPUT -p tcp -d 127.0.0.1 --dport 443 -j REDIRECT --to-port 5000 2>/dev/null || true
 iptables -t nat -D OUTPUT -p tcp -d "$BRIDGE_IP" --dport 443 -j REDIRECT --to-port 5000 2>/dev/null || true
@@ -189,13 +189,21 @@ iptables -t nat -A PREROUTING -p tcp --dport 80 -j REDIRECT --to-port 5000
 iptables -t nat -A OUTPUT -p tcp -d 127.0.0.1 --dport 80 -j REDIRECT --to-port 5000
 iptables -t nat -A OUTPUT -p tcp -d "$BRIDGE_IP" --dport 80 -j REDIRECT --to-port 5000
 
-# Forward external connections on port 443 (HTTPS) to port 5000
-iptables -t nat -A PREROUTING -p tcp --dport 443 -j REDIRECT --to-port 5000
-iptables -t nat -A OUTPUT -p tcp -d 127.0.0.1 --dport 443 -j REDIRECT --to-port 5000
-iptables -t nat -A OUTPUT -p tcp -d "$BRIDGE_IP" --dport 443 -j REDIRECT --to-port 5000
-
 echo "  ✓ Port forwarding configured: 80 → 5000 (HTTP)"
-echo "  ✓ Port forwarding configured: 443 → 5000 (HTTPS)"
+
+# HTTPS (443) is handled by nginx (app/nginx.conf), which terminates TLS and
+# proxies to port 5000. Port 5000 only speaks plain HTTP, so 443 is never
+# redirected there; without nginx, HTTPS is simply unavailable.
+if command -v nginx &> /dev/null; then
+    echo "  ✓ nginx found: port 443 (HTTPS) left to nginx"
+else
+    echo "  Warning: nginx is not installed, HTTPS (port 443) will not be available"
+    echo "  To enable HTTPS, install nginx and deploy app/nginx.conf:"
+    echo "    sudo apt-get install nginx"
+    echo "    sudo cp app/nginx.conf /etc/nginx/sites-available/nexum"
+    echo "    sudo ln -s /etc/nginx/sites-available/nexum /etc/nginx/sites-enabled/nexum"
+    echo "    sudo nginx -t && sudo systemctl reload nginx"
+fi
 
 # ==============================================================================
 # Save iptables rules (make persistent)
@@ -250,18 +258,18 @@ echo ""
 echo "Configuration:"
 echo "  DNS: nexum → $BRIDGE_IP"
 echo "  Port forwarding: 80 → 5000 (HTTP)"
-echo "  Port forwarding: 443 → 5000 (HTTPS)"
+echo "  Port 443 (HTTPS): nginx only, never forwarded to 5000"
 echo ""
 echo "Testing:"
 echo "  From a device connected to the AP, try:"
 echo "    HTTP:  http://nexum/"
 echo "    HTTPS: https://nexum/"
-echo "    Both should forward to http://$BRIDGE_IP:5000 (or https:// if certificates are present)"
+echo "    HTTP forwards to http://$BRIDGE_IP:5000; HTTPS is served by nginx (app/nginx.conf)"
 echo ""
 echo "Note:"
 echo "  - DNS changes take effect immediately for new connections"
 echo "  - Existing connections may need to be refreshed"
-echo "  - Port forwarding works for all connections to ports 80 and 443"
-echo "  - HTTPS requires cert.pem and key.pem in the app directory"
+echo "  - Port forwarding works for all connections to port 80"
+echo "  - HTTPS requires nginx (app/nginx.conf) and cert.pem/key.pem in the app directory"
 echo ""
 